@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import math
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -152,6 +153,15 @@ def _safe_snippet(text: str, max_length: int = 280) -> str:
     return f"{text[: max_length - 1]}…"
 
 
+def _normalize_embedding(values: Sequence[float]) -> List[float]:
+    """Scale ``values`` to unit length so inner product equals cosine similarity."""
+
+    norm = math.sqrt(math.fsum(value * value for value in values))
+    if norm == 0.0:
+        return list(values)
+    return [value / norm for value in values]
+
+
 async def generate_embedding(text: str) -> List[float]:
     client = await _get_client()
     start = time.perf_counter()
@@ -165,7 +175,7 @@ async def generate_embedding(text: str) -> List[float]:
         "Generated embedding",
         extra={"duration_ms": int(duration * 1000), "tokens": len(text.split())},
     )
-    return response.data[0].embedding
+    return _normalize_embedding(response.data[0].embedding)
 
 
 async def backfill_missing_faq_embeddings(
@@ -192,7 +202,7 @@ async def backfill_missing_faq_embeddings(
                 extra={"faq_id": faq.id, "tenant_id": faq.tenant_id, "error": str(exc)},
             )
             continue
-        faq.embedding = response.data[0].embedding
+        faq.embedding = _normalize_embedding(response.data[0].embedding)
         db.add(faq)
         updated += 1
     db.commit()
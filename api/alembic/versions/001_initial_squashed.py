@@ -1,12 +1,13 @@
 """Squashed baseline for dev reset."""
 
-from __future__ import annotations
-
-from typing import Sequence
+from dataclasses import dataclass, field
+from typing import Sequence, Set, Tuple
 
 import sqlalchemy as sa
 from alembic import op
 from pgvector.sqlalchemy import Vector
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable, ExecutableDDLElement
 
 from logging_utils import get_logger
 
@@ -19,127 +20,314 @@ SCHEMA = "public"
 VECTOR_EXTENSION = "vector"
 BTREE_GIST_EXTENSION = "btree_gist"
 UNAVAILABILITY_EXCLUSION = "uq_unavailability_owner_dates"
+UNAVAILABILITY_RANGE_COLUMN = "range"
+MAINTENANCE_WORK_MEM = "1GB"
+MAX_PARALLEL_MAINTENANCE_WORKERS = 4
+# Asynchronous commit is only acceptable because this is the dev-reset
+# baseline: a crash right after commit means re-running it, not lost data.
+# It only takes effect at COMMIT, and env.py commits all pending revisions
+# together, so it covers that whole run rather than this revision alone.
+SYNCHRONOUS_COMMIT = "off"
+ROLE_ENUM_VALUES = ("inbound", "assistant")
+APPT_STATUS_ENUM_VALUES = ("pending", "confirmed", "cancelled")
 
 logger = get_logger("alembic.001_initial_squashed")
 
 
-def _ensure_extension(extension: str) -> None:
+@dataclass
+class SchemaSnapshot:
+    """Catalog state captured once per run; helpers update it as DDL is queued."""
+
+    tables: Set[str] = field(default_factory=set)
+    indexes: Set[Tuple[str, str]] = field(default_factory=set)
+    constraints: Set[str] = field(default_factory=set)
+    enums: Set[str] = field(default_factory=set)
+
+
+def _snapshot(bind: sa.engine.Connection) -> SchemaSnapshot:
+    """Load tables, indexes, constraints and enums up front instead of per check."""
+
+    if bind.dialect.name != "postgresql":
+        inspector = sa.inspect(bind)
+        tables = set(inspector.get_table_names(schema=SCHEMA))
+        indexes = {
+            (table_name, str(idx["name"]))
+            for table_name in tables
+            for idx in inspector.get_indexes(table_name, schema=SCHEMA)
+        }
+        return SchemaSnapshot(tables=tables, indexes=indexes)
+
+    # One round-trip for the whole catalog picture; each row is tagged with
+    # the set it belongs to.
+    rows = bind.execute(
+        sa.text(
+            """
+            SELECT 'table', tablename, NULL
+            FROM pg_tables
+            WHERE schemaname = :schema_name
+            UNION ALL
+            SELECT 'index', tablename, indexname
+            FROM pg_indexes
+            WHERE schemaname = :schema_name
+            UNION ALL
+            SELECT 'constraint', c.conname, NULL
+            FROM pg_constraint c
+            JOIN pg_namespace n ON n.oid = c.connamespace
+            WHERE n.nspname = :schema_name
+            UNION ALL
+            SELECT 'enum', t.typname, NULL
+            FROM pg_type t
+            JOIN pg_namespace n ON n.oid = t.typnamespace
+            WHERE n.nspname = :schema_name AND t.typtype = 'e'
+            """
+        ),
+        {"schema_name": SCHEMA},
+    )
+    snapshot = SchemaSnapshot()
+    for kind, name, index_name in rows:
+        if kind == "table":
+            snapshot.tables.add(str(name))
+        elif kind == "index":
+            snapshot.indexes.add((str(name), str(index_name)))
+        elif kind == "constraint":
+            snapshot.constraints.add(str(name))
+        else:
+            snapshot.enums.add(str(name))
+    return snapshot
+
+
+@dataclass
+class MigrationCtx:
+    """Connection facts resolved once per run and threaded through the helpers."""
+
+    bind: sa.engine.Connection
+    dialect: str
+    snapshot: SchemaSnapshot
+
+
+def _migration_ctx(*, introspect: bool = True) -> MigrationCtx:
+    """Build the run context.
+
+    ``introspect=False`` skips the catalog snapshot on PostgreSQL, for paths
+    where every statement carries its own ``IF [NOT] EXISTS`` guard.
+    """
+
     bind = op.get_bind()
     dialect = bind.dialect.name
-    if dialect != "postgresql":
+    if introspect or dialect != "postgresql":
+        snapshot = _snapshot(bind)
+    else:
+        snapshot = SchemaSnapshot()
+    return MigrationCtx(bind=bind, dialect=dialect, snapshot=snapshot)
+
+
+def _queue_async_commit(
+    ctx: MigrationCtx, statements: list[ExecutableDDLElement]
+) -> None:
+    """Let the migration commit return without waiting for the WAL flush."""
+
+    if ctx.dialect != "postgresql":
+        return
+
+    logger.info(
+        "Disabling synchronous commit for this transaction",
+        extra={"synchronous_commit": SYNCHRONOUS_COMMIT},
+    )
+    statements.append(sa.DDL(f"SET LOCAL synchronous_commit = {SYNCHRONOUS_COMMIT}"))
+
+
+def _queue_maintenance_settings(
+    ctx: MigrationCtx, statements: list[ExecutableDDLElement]
+) -> None:
+    """Give index builds more sort memory and parallel workers for this transaction.
+
+    Neutral on a fresh database; on a populated re-baseline the B-tree and
+    GiST builds sort in memory and fan out across workers.
+    """
+
+    if ctx.dialect != "postgresql":
+        return
+
+    logger.info(
+        "Raising maintenance settings for index builds",
+        extra={
+            "maintenance_work_mem": MAINTENANCE_WORK_MEM,
+            "max_parallel_maintenance_workers": MAX_PARALLEL_MAINTENANCE_WORKERS,
+        },
+    )
+    statements.extend(
+        [
+            sa.DDL(f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"),
+            sa.DDL(
+                "SET LOCAL max_parallel_maintenance_workers = "
+                f"{MAX_PARALLEL_MAINTENANCE_WORKERS}"
+            ),
+        ]
+    )
+
+
+def _queue_maintenance_reset(
+    ctx: MigrationCtx, statements: list[ExecutableDDLElement]
+) -> None:
+    """Restore the maintenance settings once the baseline's own builds are queued.
+
+    env.py runs every pending revision in one transaction, so without this the
+    raised limits would also cover the later revisions' index and copy work.
+    """
+
+    if ctx.dialect != "postgresql":
+        return
+
+    statements.extend(
+        [
+            sa.DDL("RESET maintenance_work_mem"),
+            sa.DDL("RESET max_parallel_maintenance_workers"),
+        ]
+    )
+
+
+def _ensure_extension(
+    ctx: MigrationCtx, statements: list[ExecutableDDLElement], extension: str
+) -> None:
+    if ctx.dialect != "postgresql":
         logger.info(
             "Skipping extension on non-PostgreSQL dialect",
-            extra={"extension": extension, "dialect": dialect},
+            extra={"extension": extension, "dialect": ctx.dialect},
         )
         return
 
     logger.info("Ensuring extension exists", extra={"extension": extension})
-    op.execute(sa.text(f'CREATE EXTENSION IF NOT EXISTS "{extension}"'))
+    statements.append(sa.DDL(f'CREATE EXTENSION IF NOT EXISTS "{extension}"'))
 
 
-def _ensure_enum(name: str, values: Sequence[str]) -> None:
-    bind = op.get_bind()
-    dialect = bind.dialect.name
-    if dialect != "postgresql":
+def _ensure_enum(
+    ctx: MigrationCtx, statements: list[ExecutableDDLElement], enum: postgresql.ENUM
+) -> None:
+    name = str(enum.name)
+    if ctx.dialect != "postgresql":
         logger.info(
             "Skipping enum creation on non-PostgreSQL dialect",
-            extra={"enum": name, "dialect": dialect},
+            extra={"enum": name, "dialect": ctx.dialect},
         )
         return
 
-    quoted_values = ", ".join(f"'{value}'" for value in values)
-    logger.info("Ensuring enum exists", extra={"enum": name})
-    op.execute(
-        sa.text(
-            f"""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1
-                    FROM pg_type t
-                    JOIN pg_namespace n ON n.oid = t.typnamespace
-                    WHERE t.typname = '{name}' AND n.nspname = '{SCHEMA}'
-                ) THEN
-                    CREATE TYPE {SCHEMA}.{name} AS ENUM ({quoted_values});
-                END IF;
-            END;
-            $$;
-            """
-        )
-    )
+    if name in ctx.snapshot.enums:
+        logger.info("Enum already exists; skipping create", extra={"enum": name})
+        return
 
+    # The dialect renders the schema-qualified name and escapes each label.
+    logger.info("Creating enum", extra={"enum": name})
+    statements.append(postgresql.CreateEnumType(enum))
+    ctx.snapshot.enums.add(name)
 
-def _build_enum(name: str, values: Sequence[str]) -> sa.Enum:
-    bind = op.get_bind()
-    enum_kwargs: dict[str, object] = {"name": name}
-    if bind.dialect.name == "postgresql":
-        _ensure_enum(name, values)
-        enum_kwargs.update({"schema": SCHEMA, "create_type": False})
-    return sa.Enum(*values, **enum_kwargs)
 
+def _table_exists(ctx: MigrationCtx, table_name: str) -> bool:
+    return table_name in ctx.snapshot.tables
 
-def _table_exists(bind: sa.engine.Connection, table_name: str) -> bool:
-    inspector = sa.inspect(bind)
-    return inspector.has_table(table_name, schema=SCHEMA)
 
+def _index_exists(ctx: MigrationCtx, table_name: str, index_name: str) -> bool:
+    return (table_name, index_name) in ctx.snapshot.indexes
 
-def _index_exists(bind: sa.engine.Connection, table_name: str, index_name: str) -> bool:
-    inspector = sa.inspect(bind)
-    indexes = inspector.get_indexes(table_name, schema=SCHEMA)
-    return any(idx["name"] == index_name for idx in indexes)
 
+def _constraint_exists(ctx: MigrationCtx, constraint_name: str) -> bool:
+    return constraint_name in ctx.snapshot.constraints
 
-def _constraint_exists(bind: sa.engine.Connection, constraint_name: str) -> bool:
-    if bind.dialect.name != "postgresql":
+
+def _queue_table(
+    ctx: MigrationCtx,
+    statements: list[ExecutableDDLElement],
+    table: sa.Table,
+) -> bool:
+    """Queue ``CREATE TABLE``; return True if the table is known to be new.
+
+    PostgreSQL gets ``IF NOT EXISTS`` so a re-run costs one catalog lookup per
+    statement on the server instead of inspector round-trips from here.
+    """
+
+    if ctx.dialect == "postgresql":
+        logger.info("Ensuring table exists", extra={"table": f"{SCHEMA}.{table.name}"})
+        statements.append(CreateTable(table, if_not_exists=True))
+        ctx.snapshot.tables.add(table.name)
         return False
-    result = bind.execute(
-        sa.text(
-            """
-            SELECT 1
-            FROM pg_constraint c
-            JOIN pg_namespace n ON n.oid = c.connamespace
-            WHERE c.conname = :constraint_name AND n.nspname = :schema_name
-            """
-        ),
-        {"constraint_name": constraint_name, "schema_name": SCHEMA},
-    )
-    return result.scalar() is not None
+
+    if _table_exists(ctx, table.name):
+        logger.info(
+            "Table already exists; skipping create",
+            extra={"table": f"{SCHEMA}.{table.name}"},
+        )
+        return False
+
+    logger.info("Creating table", extra={"table": f"{SCHEMA}.{table.name}"})
+    statements.append(CreateTable(table))
+    ctx.snapshot.tables.add(table.name)
+    return True
 
 
-def _create_index_if_missing(
-    bind: sa.engine.Connection,
-    index_name: str,
-    table_name: str,
-    columns: Sequence[str],
+def _queue_index_if_missing(
+    ctx: MigrationCtx,
+    statements: list[ExecutableDDLElement],
+    index: sa.Index,
     *,
-    unique: bool = False,
+    table_is_new: bool,
 ) -> None:
-    if _index_exists(bind, table_name, index_name):
+    table_name = index.table.name if index.table is not None else ""
+    if ctx.dialect == "postgresql":
+        logger.info(
+            "Ensuring index exists",
+            extra={"table": f"{SCHEMA}.{table_name}", "index": index.name},
+        )
+        statements.append(CreateIndex(index, if_not_exists=True))
+        ctx.snapshot.indexes.add((table_name, str(index.name)))
+        return
+
+    if not table_is_new and _index_exists(ctx, table_name, str(index.name)):
         logger.info(
             "Index already exists; skipping create",
-            extra={"table": f"{SCHEMA}.{table_name}", "index": index_name},
+            extra={"table": f"{SCHEMA}.{table_name}", "index": index.name},
         )
         return
 
     logger.info(
         "Creating index",
-        extra={"table": f"{SCHEMA}.{table_name}", "index": index_name},
+        extra={"table": f"{SCHEMA}.{table_name}", "index": index.name},
     )
-    op.create_index(index_name, table_name, list(columns), unique=unique, schema=SCHEMA)
+    statements.append(CreateIndex(index))
+    ctx.snapshot.indexes.add((table_name, str(index.name)))
 
 
-def _drop_index_if_exists(
-    bind: sa.engine.Connection,
-    index_name: str,
-    table_name: str,
+def _execute_ddl_batch(
+    ctx: MigrationCtx, statements: Sequence[ExecutableDDLElement]
 ) -> None:
-    if not _table_exists(bind, table_name):
+    """Send queued DDL to the server in a single round-trip on PostgreSQL.
+
+    Statements run in queue order inside the migration transaction, so
+    extensions and enum types are in place before the tables that use them.
+    """
+
+    if not statements:
+        return
+
+    if ctx.dialect != "postgresql":
+        for statement in statements:
+            op.execute(statement)
+        return
+
+    script = ";\n".join(
+        str(statement.compile(dialect=ctx.bind.dialect)).strip().rstrip(";")
+        for statement in statements
+    )
+    logger.info("Executing batched DDL", extra={"statements": len(statements)})
+    op.execute(sa.text(script))
+
+
+def _drop_index_if_exists(ctx: MigrationCtx, index_name: str, table_name: str) -> None:
+    if not _table_exists(ctx, table_name):
         logger.info(
             "Skipping drop index; table missing",
             extra={"table": f"{SCHEMA}.{table_name}", "index": index_name},
         )
         return
-    if not _index_exists(bind, table_name, index_name):
+    if not _index_exists(ctx, table_name, index_name):
         logger.info(
             "Skipping drop index; index missing",
             extra={"table": f"{SCHEMA}.{table_name}", "index": index_name},
@@ -151,10 +339,23 @@ def _drop_index_if_exists(
         extra={"table": f"{SCHEMA}.{table_name}", "index": index_name},
     )
     op.drop_index(index_name, table_name=table_name, schema=SCHEMA)
+    ctx.snapshot.indexes.discard((table_name, index_name))
 
 
-def _drop_table_if_exists(bind: sa.engine.Connection, table_name: str) -> None:
-    if not _table_exists(bind, table_name):
+def _drop_table_if_exists(
+    ctx: MigrationCtx, statements: list[ExecutableDDLElement], table_name: str
+) -> None:
+    if ctx.dialect == "postgresql":
+        # CASCADE takes the table's indexes and constraints with it.
+        logger.info(
+            "Dropping table if present", extra={"table": f"{SCHEMA}.{table_name}"}
+        )
+        statements.append(
+            sa.DDL(f'DROP TABLE IF EXISTS "{SCHEMA}"."{table_name}" CASCADE')
+        )
+        return
+
+    if not _table_exists(ctx, table_name):
         logger.info(
             "Skipping drop table; already absent",
             extra={"table": f"{SCHEMA}.{table_name}"},
@@ -163,17 +364,21 @@ def _drop_table_if_exists(bind: sa.engine.Connection, table_name: str) -> None:
 
     logger.info("Dropping table", extra={"table": f"{SCHEMA}.{table_name}"})
     op.drop_table(table_name, schema=SCHEMA)
+    ctx.snapshot.tables.discard(table_name)
+    ctx.snapshot.indexes = {key for key in ctx.snapshot.indexes if key[0] != table_name}
 
 
-def _ensure_unavailability_constraint(bind: sa.engine.Connection) -> None:
-    if bind.dialect.name != "postgresql":
+def _ensure_unavailability_constraint(
+    ctx: MigrationCtx, statements: list[ExecutableDDLElement]
+) -> None:
+    if ctx.dialect != "postgresql":
         logger.info(
             "Skipping exclusion constraint on non-PostgreSQL dialect",
             extra={"constraint": UNAVAILABILITY_EXCLUSION},
         )
         return
 
-    if _constraint_exists(bind, UNAVAILABILITY_EXCLUSION):
+    if _constraint_exists(ctx, UNAVAILABILITY_EXCLUSION):
         logger.info(
             "Exclusion constraint already exists; skipping create",
             extra={"constraint": UNAVAILABILITY_EXCLUSION},
@@ -184,368 +389,292 @@ def _ensure_unavailability_constraint(bind: sa.engine.Connection) -> None:
         "Creating exclusion constraint",
         extra={"constraint": UNAVAILABILITY_EXCLUSION},
     )
-    op.execute(
-        sa.text(
+    # The stored range is built once per row write, so conflict probes compare
+    # the indexed value instead of calling daterange() for every candidate.
+    # It is PostgreSQL-only, which is why it lives here and not on the Table.
+    statements.append(
+        sa.DDL(
             f"""
             ALTER TABLE "{SCHEMA}"."unavailability"
-            ADD CONSTRAINT {UNAVAILABILITY_EXCLUSION}
-            EXCLUDE USING gist (
-                tenant_id WITH =,
-                owner_phone WITH =,
-                daterange(starts_on, ends_on, '[]') WITH &&
-            )
+            ADD COLUMN IF NOT EXISTS "{UNAVAILABILITY_RANGE_COLUMN}" daterange
+            GENERATED ALWAYS AS (daterange(starts_on, ends_on, '[]')) STORED
             """
         )
     )
-
-
-def _drop_unavailability_constraint(bind: sa.engine.Connection) -> None:
-    if bind.dialect.name != "postgresql":
-        return
-    if not _constraint_exists(bind, UNAVAILABILITY_EXCLUSION):
-        logger.info(
-            "Skipping drop constraint; already absent",
-            extra={"constraint": UNAVAILABILITY_EXCLUSION},
-        )
-        return
-
-    logger.info(
-        "Dropping exclusion constraint",
-        extra={"constraint": UNAVAILABILITY_EXCLUSION},
-    )
-    op.execute(
-        sa.text(
+    statements.append(
+        sa.DDL(
             f"""
             ALTER TABLE "{SCHEMA}"."unavailability"
-            DROP CONSTRAINT {UNAVAILABILITY_EXCLUSION}
+            ADD CONSTRAINT {UNAVAILABILITY_EXCLUSION}
+            EXCLUDE USING gist (
+                tenant_id WITH =,
+                owner_phone WITH =,
+                "{UNAVAILABILITY_RANGE_COLUMN}" WITH &&
+            )
             """
         )
     )
+    ctx.snapshot.constraints.add(UNAVAILABILITY_EXCLUSION)
+
+
+# Declared once at import; upgrade() only compiles these into DDL.
+metadata = sa.MetaData(schema=SCHEMA)
+
+# Types are created by _ensure_enum; the column types only reference them.
+role_enum = postgresql.ENUM(
+    *ROLE_ENUM_VALUES, name="role_enum", schema=SCHEMA, create_type=False
+)
+appt_status_enum = postgresql.ENUM(
+    *APPT_STATUS_ENUM_VALUES, name="appt_status_enum", schema=SCHEMA, create_type=False
+)
+
+tenants = sa.Table(
+    "tenants",
+    metadata,
+    sa.Column("id", sa.String(length=255), nullable=False),
+    sa.Column("phone_id", sa.String(length=255), nullable=False),
+    sa.Column("wh_token", sa.Text(), nullable=False),
+    sa.Column(
+        "system_prompt",
+        sa.Text(),
+        nullable=False,
+        server_default="You are a helpful assistant.",
+    ),
+    sa.PrimaryKeyConstraint("id"),
+)
+
+messages = sa.Table(
+    "messages",
+    metadata,
+    sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column("tenant_id", sa.String(length=255), nullable=False),
+    sa.Column("wa_msg_id", sa.String(length=255), nullable=True),
+    sa.Column("role", role_enum, nullable=False),
+    sa.Column("text", sa.Text(), nullable=False),
+    sa.Column("tokens", sa.Integer(), nullable=True),
+    sa.Column(
+        "ts",
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("now()"),
+    ),
+    sa.ForeignKeyConstraint(
+        ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
+    ),
+    sa.PrimaryKeyConstraint("id"),
+    sa.UniqueConstraint("wa_msg_id", name="uq_messages_wa_msg_id"),
+)
+
+faqs = sa.Table(
+    "faqs",
+    metadata,
+    sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column("tenant_id", sa.String(length=255), nullable=False),
+    sa.Column("question", sa.String(length=500), nullable=False),
+    sa.Column("answer", sa.Text(), nullable=False),
+    sa.Column("embedding", Vector(1536), nullable=True),
+    sa.ForeignKeyConstraint(
+        ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
+    ),
+    sa.PrimaryKeyConstraint("id"),
+)
+
+usage = sa.Table(
+    "usage",
+    metadata,
+    sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column("tenant_id", sa.String(length=255), nullable=False),
+    sa.Column("direction", sa.String(length=64), nullable=True),
+    sa.Column("tokens", sa.Integer(), nullable=True),
+    sa.Column(
+        "msg_ts",
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("now()"),
+    ),
+    sa.Column("model", sa.String(length=255), nullable=True),
+    sa.Column(
+        "prompt_tokens",
+        sa.Integer(),
+        nullable=False,
+        default=0,
+        server_default=sa.text("0"),
+    ),
+    sa.Column(
+        "completion_tokens",
+        sa.Integer(),
+        nullable=False,
+        default=0,
+        server_default=sa.text("0"),
+    ),
+    sa.Column(
+        "total_tokens",
+        sa.Integer(),
+        nullable=False,
+        default=0,
+        server_default=sa.text("0"),
+    ),
+    sa.Column("trace_id", sa.String(length=255), nullable=True),
+    sa.ForeignKeyConstraint(
+        ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
+    ),
+    sa.PrimaryKeyConstraint("id"),
+)
+
+appointments = sa.Table(
+    "appointments",
+    metadata,
+    sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column("tenant_id", sa.String(length=255), nullable=False),
+    sa.Column("customer_phone", sa.String(length=50), nullable=False),
+    sa.Column("customer_email", sa.String(length=255), nullable=True),
+    sa.Column("starts_at", sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column(
+        "status",
+        appt_status_enum,
+        nullable=False,
+        server_default=sa.text("'pending'"),
+    ),
+    sa.Column("google_event_id", sa.String(length=255), nullable=True),
+    sa.Column(
+        "reminded",
+        sa.Boolean(),
+        nullable=False,
+        server_default=sa.text("false"),
+    ),
+    sa.Column(
+        "created_ts",
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("now()"),
+    ),
+    sa.ForeignKeyConstraint(
+        ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
+    ),
+    sa.PrimaryKeyConstraint("id"),
+)
+
+owner_contacts = sa.Table(
+    "owner_contacts",
+    metadata,
+    sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column("tenant_id", sa.String(length=255), nullable=False),
+    sa.Column("phone_number", sa.String(length=64), nullable=False),
+    sa.Column("display_name", sa.String(length=255), nullable=True),
+    sa.Column(
+        "created_ts",
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("now()"),
+    ),
+    sa.ForeignKeyConstraint(
+        ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
+    ),
+    sa.PrimaryKeyConstraint("id"),
+)
+
+unavailability = sa.Table(
+    "unavailability",
+    metadata,
+    sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column("tenant_id", sa.String(length=255), nullable=False),
+    sa.Column("owner_phone", sa.String(length=64), nullable=False),
+    sa.Column("starts_on", sa.DATE(), nullable=False),
+    sa.Column("ends_on", sa.DATE(), nullable=False),
+    sa.Column(
+        "created_ts",
+        sa.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sa.text("now()"),
+    ),
+    sa.ForeignKeyConstraint(
+        ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
+    ),
+    sa.PrimaryKeyConstraint("id"),
+)
+
+# Foreign-key dependency order from the MetaData itself, so new tables need no
+# hand-placed position; downgrade walks it in reverse.
+BASELINE_TABLES: Tuple[sa.Table, ...] = tuple(metadata.sorted_tables)
+
+BASELINE_INDEXES: Tuple[sa.Index, ...] = (
+    sa.Index("ix_tenants_id", tenants.c.id),
+    sa.Index("uq_tenants_phone_id", tenants.c.phone_id, unique=True),
+    sa.Index("ix_messages_tenant_id", messages.c.tenant_id),
+    sa.Index("ix_faqs_tenant_id", faqs.c.tenant_id),
+    sa.Index("ix_usage_tenant_id", usage.c.tenant_id),
+    sa.Index("ix_usage_tenant_id_msg_ts", usage.c.tenant_id, usage.c.msg_ts),
+    sa.Index("ix_usage_tenant_id_id", usage.c.tenant_id, usage.c.id),
+    sa.Index("ix_appointments_tenant_id", appointments.c.tenant_id),
+    sa.Index("ix_owner_contacts_tenant_id", owner_contacts.c.tenant_id),
+    sa.Index("ix_owner_contacts_phone_number", owner_contacts.c.phone_number),
+    sa.Index("ix_unavailability_tenant_id", unavailability.c.tenant_id),
+    sa.Index(
+        "ix_unavailability_tenant_dates",
+        unavailability.c.tenant_id,
+        unavailability.c.starts_on,
+        unavailability.c.ends_on,
+    ),
+)
 
 
 def upgrade() -> None:
-    bind = op.get_bind()
     logger.info("Starting baseline upgrade", extra={"schema": SCHEMA})
-
-    _ensure_extension(VECTOR_EXTENSION)
-    _ensure_extension(BTREE_GIST_EXTENSION)
-
-    role_enum = _build_enum("role_enum", ["inbound", "assistant"])
-    appt_status_enum = _build_enum(
-        "appt_status_enum", ["pending", "confirmed", "cancelled"]
-    )
-
-    if not _table_exists(bind, "tenants"):
-        logger.info("Creating table", extra={"table": f"{SCHEMA}.tenants"})
-        op.create_table(
-            "tenants",
-            sa.Column("id", sa.String(length=255), nullable=False),
-            sa.Column("phone_id", sa.String(length=255), nullable=False),
-            sa.Column("wh_token", sa.Text(), nullable=False),
-            sa.Column(
-                "system_prompt",
-                sa.Text(),
-                nullable=False,
-                server_default="You are a helpful assistant.",
-            ),
-            sa.PrimaryKeyConstraint("id"),
-            schema=SCHEMA,
-        )
-    else:
-        logger.info(
-            "Table already exists; skipping create",
-            extra={"table": f"{SCHEMA}.tenants"},
-        )
-
-    _create_index_if_missing(bind, op.f("ix_tenants_id"), "tenants", ["id"])
-    _create_index_if_missing(
-        bind,
-        "uq_tenants_phone_id",
-        "tenants",
-        ["phone_id"],
-        unique=True,
-    )
-
-    if not _table_exists(bind, "messages"):
-        logger.info("Creating table", extra={"table": f"{SCHEMA}.messages"})
-        op.create_table(
-            "messages",
-            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
-            sa.Column("tenant_id", sa.String(length=255), nullable=False),
-            sa.Column("wa_msg_id", sa.String(length=255), nullable=True),
-            sa.Column("role", role_enum, nullable=False),
-            sa.Column("text", sa.Text(), nullable=False),
-            sa.Column("tokens", sa.Integer(), nullable=True),
-            sa.Column(
-                "ts",
-                sa.TIMESTAMP(timezone=True),
-                nullable=False,
-                server_default=sa.text("now()"),
-            ),
-            sa.ForeignKeyConstraint(
-                ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
-            ),
-            sa.PrimaryKeyConstraint("id"),
-            sa.UniqueConstraint("wa_msg_id", name="uq_messages_wa_msg_id"),
-            schema=SCHEMA,
-        )
-    else:
-        logger.info(
-            "Table already exists; skipping create",
-            extra={"table": f"{SCHEMA}.messages"},
-        )
-
-    _create_index_if_missing(bind, op.f("ix_messages_tenant_id"), "messages", ["tenant_id"])
-
-    if not _table_exists(bind, "faqs"):
-        logger.info("Creating table", extra={"table": f"{SCHEMA}.faqs"})
-        op.create_table(
-            "faqs",
-            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
-            sa.Column("tenant_id", sa.String(length=255), nullable=False),
-            sa.Column("question", sa.String(length=500), nullable=False),
-            sa.Column("answer", sa.Text(), nullable=False),
-            sa.Column("embedding", Vector(1536), nullable=True),
-            sa.ForeignKeyConstraint(
-                ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
-            ),
-            sa.PrimaryKeyConstraint("id"),
-            schema=SCHEMA,
-        )
-    else:
-        logger.info(
-            "Table already exists; skipping create",
-            extra={"table": f"{SCHEMA}.faqs"},
-        )
-
-    _create_index_if_missing(bind, op.f("ix_faqs_tenant_id"), "faqs", ["tenant_id"])
-
-    if not _table_exists(bind, "usage"):
-        logger.info("Creating table", extra={"table": f"{SCHEMA}.usage"})
-        op.create_table(
-            "usage",
-            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
-            sa.Column("tenant_id", sa.String(length=255), nullable=False),
-            sa.Column("direction", sa.String(length=64), nullable=True),
-            sa.Column("tokens", sa.Integer(), nullable=True),
-            sa.Column(
-                "msg_ts",
-                sa.TIMESTAMP(timezone=True),
-                nullable=False,
-                server_default=sa.text("now()"),
-            ),
-            sa.Column("model", sa.String(length=255), nullable=True),
-            sa.Column(
-                "prompt_tokens",
-                sa.Integer(),
-                nullable=False,
-                default=0,
-                server_default=sa.text("0"),
-            ),
-            sa.Column(
-                "completion_tokens",
-                sa.Integer(),
-                nullable=False,
-                default=0,
-                server_default=sa.text("0"),
-            ),
-            sa.Column(
-                "total_tokens",
-                sa.Integer(),
-                nullable=False,
-                default=0,
-                server_default=sa.text("0"),
-            ),
-            sa.Column("trace_id", sa.String(length=255), nullable=True),
-            sa.ForeignKeyConstraint(
-                ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
-            ),
-            sa.PrimaryKeyConstraint("id"),
-            schema=SCHEMA,
-        )
-    else:
-        logger.info(
-            "Table already exists; skipping create",
-            extra={"table": f"{SCHEMA}.usage"},
-        )
-
-    _create_index_if_missing(bind, op.f("ix_usage_tenant_id"), "usage", ["tenant_id"])
-    _create_index_if_missing(
-        bind,
-        "ix_usage_tenant_id_msg_ts",
-        "usage",
-        ["tenant_id", "msg_ts"],
-    )
-    _create_index_if_missing(
-        bind,
-        "ix_usage_tenant_id_id",
-        "usage",
-        ["tenant_id", "id"],
-    )
-
-    if not _table_exists(bind, "appointments"):
-        logger.info("Creating table", extra={"table": f"{SCHEMA}.appointments"})
-        op.create_table(
-            "appointments",
-            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
-            sa.Column("tenant_id", sa.String(length=255), nullable=False),
-            sa.Column("customer_phone", sa.String(length=50), nullable=False),
-            sa.Column("customer_email", sa.String(length=255), nullable=True),
-            sa.Column("starts_at", sa.TIMESTAMP(timezone=True), nullable=False),
-            sa.Column(
-                "status",
-                appt_status_enum,
-                nullable=False,
-                server_default=sa.text("'pending'"),
-            ),
-            sa.Column("google_event_id", sa.String(length=255), nullable=True),
-            sa.Column(
-                "reminded",
-                sa.Boolean(),
-                nullable=False,
-                server_default=sa.text("false"),
-            ),
-            sa.Column(
-                "created_ts",
-                sa.TIMESTAMP(timezone=True),
-                nullable=False,
-                server_default=sa.text("now()"),
-            ),
-            sa.ForeignKeyConstraint(
-                ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
-            ),
-            sa.PrimaryKeyConstraint("id"),
-            schema=SCHEMA,
-        )
-    else:
-        logger.info(
-            "Table already exists; skipping create",
-            extra={"table": f"{SCHEMA}.appointments"},
-        )
-
-    _create_index_if_missing(bind, op.f("ix_appointments_tenant_id"), "appointments", ["tenant_id"])
-
-    if not _table_exists(bind, "owner_contacts"):
-        logger.info("Creating table", extra={"table": f"{SCHEMA}.owner_contacts"})
-        op.create_table(
-            "owner_contacts",
-            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
-            sa.Column("tenant_id", sa.String(length=255), nullable=False),
-            sa.Column("phone_number", sa.String(length=64), nullable=False),
-            sa.Column("display_name", sa.String(length=255), nullable=True),
-            sa.Column(
-                "created_ts",
-                sa.TIMESTAMP(timezone=True),
-                nullable=False,
-                server_default=sa.text("now()"),
-            ),
-            sa.ForeignKeyConstraint(
-                ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
-            ),
-            sa.PrimaryKeyConstraint("id"),
-            schema=SCHEMA,
-        )
-    else:
-        logger.info(
-            "Table already exists; skipping create",
-            extra={"table": f"{SCHEMA}.owner_contacts"},
-        )
-
-    _create_index_if_missing(
-        bind,
-        op.f("ix_owner_contacts_tenant_id"),
-        "owner_contacts",
-        ["tenant_id"],
-    )
-    _create_index_if_missing(
-        bind,
-        op.f("ix_owner_contacts_phone_number"),
-        "owner_contacts",
-        ["phone_number"],
-    )
-
-    if not _table_exists(bind, "unavailability"):
-        logger.info("Creating table", extra={"table": f"{SCHEMA}.unavailability"})
-        op.create_table(
-            "unavailability",
-            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
-            sa.Column("tenant_id", sa.String(length=255), nullable=False),
-            sa.Column("owner_phone", sa.String(length=64), nullable=False),
-            sa.Column("starts_on", sa.DATE(), nullable=False),
-            sa.Column("ends_on", sa.DATE(), nullable=False),
-            sa.Column(
-                "created_ts",
-                sa.TIMESTAMP(timezone=True),
-                nullable=False,
-                server_default=sa.text("now()"),
-            ),
-            sa.ForeignKeyConstraint(
-                ["tenant_id"], [f"{SCHEMA}.tenants.id"], ondelete="CASCADE"
-            ),
-            sa.PrimaryKeyConstraint("id"),
-            schema=SCHEMA,
-        )
-    else:
-        logger.info(
-            "Table already exists; skipping create",
-            extra={"table": f"{SCHEMA}.unavailability"},
+    ctx = _migration_ctx()
+    statements: list[ExecutableDDLElement] = []
+
+    _queue_async_commit(ctx, statements)
+    _queue_maintenance_settings(ctx, statements)
+    _ensure_extension(ctx, statements, VECTOR_EXTENSION)
+    _ensure_extension(ctx, statements, BTREE_GIST_EXTENSION)
+
+    _ensure_enum(ctx, statements, role_enum)
+    _ensure_enum(ctx, statements, appt_status_enum)
+
+    # Every table goes in before any index so the catalog work for relations
+    # and their indexes is grouped rather than interleaved.
+    new_tables = {
+        table.name for table in BASELINE_TABLES if _queue_table(ctx, statements, table)
+    }
+    for index in BASELINE_INDEXES:
+        table_name = index.table.name if index.table is not None else ""
+        _queue_index_if_missing(
+            ctx, statements, index, table_is_new=table_name in new_tables
         )
 
-    _create_index_if_missing(
-        bind,
-        op.f("ix_unavailability_tenant_id"),
-        "unavailability",
-        ["tenant_id"],
-    )
-    _create_index_if_missing(
-        bind,
-        "ix_unavailability_tenant_dates",
-        "unavailability",
-        ["tenant_id", "starts_on", "ends_on"],
-    )
+    _ensure_unavailability_constraint(ctx, statements)
+    _queue_maintenance_reset(ctx, statements)
 
-    _ensure_unavailability_constraint(bind)
+    _execute_ddl_batch(ctx, statements)
 
     logger.info("Baseline upgrade complete", extra={"schema": SCHEMA})
 
 
 def downgrade() -> None:
-    bind = op.get_bind()
     logger.info("Starting baseline downgrade", extra={"schema": SCHEMA})
+    ctx = _migration_ctx(introspect=False)
+    statements: list[ExecutableDDLElement] = []
 
-    _drop_unavailability_constraint(bind)
-
-    _drop_index_if_exists(bind, "ix_unavailability_tenant_dates", "unavailability")
-    _drop_index_if_exists(bind, op.f("ix_unavailability_tenant_id"), "unavailability")
-    _drop_table_if_exists(bind, "unavailability")
-
-    _drop_index_if_exists(bind, op.f("ix_owner_contacts_phone_number"), "owner_contacts")
-    _drop_index_if_exists(bind, op.f("ix_owner_contacts_tenant_id"), "owner_contacts")
-    _drop_table_if_exists(bind, "owner_contacts")
+    _queue_async_commit(ctx, statements)
 
-    _drop_index_if_exists(bind, op.f("ix_appointments_tenant_id"), "appointments")
-    _drop_table_if_exists(bind, "appointments")
+    for table in reversed(BASELINE_TABLES):
+        if ctx.dialect != "postgresql":
+            for index in BASELINE_INDEXES:
+                if index.table is table:
+                    _drop_index_if_exists(ctx, str(index.name), table.name)
+        _drop_table_if_exists(ctx, statements, table.name)
 
-    _drop_index_if_exists(bind, "ix_usage_tenant_id_id", "usage")
-    _drop_index_if_exists(bind, "ix_usage_tenant_id_msg_ts", "usage")
-    _drop_index_if_exists(bind, op.f("ix_usage_tenant_id"), "usage")
-    _drop_table_if_exists(bind, "usage")
-
-    _drop_index_if_exists(bind, op.f("ix_faqs_tenant_id"), "faqs")
-    _drop_table_if_exists(bind, "faqs")
-
-    _drop_index_if_exists(bind, op.f("ix_messages_tenant_id"), "messages")
-    _drop_table_if_exists(bind, "messages")
-
-    _drop_index_if_exists(bind, "uq_tenants_phone_id", "tenants")
-    _drop_index_if_exists(bind, op.f("ix_tenants_id"), "tenants")
-    _drop_table_if_exists(bind, "tenants")
-
-    if bind.dialect.name == "postgresql":
+    if ctx.dialect == "postgresql":
         logger.info("Dropping enums and extensions", extra={"schema": SCHEMA})
-        op.execute(sa.text(f'DROP TYPE IF EXISTS "{SCHEMA}"."appt_status_enum"'))
-        op.execute(sa.text(f'DROP TYPE IF EXISTS "{SCHEMA}"."role_enum"'))
-        op.execute(sa.text(f'DROP EXTENSION IF EXISTS "{VECTOR_EXTENSION}"'))
-        op.execute(sa.text(f'DROP EXTENSION IF EXISTS "{BTREE_GIST_EXTENSION}"'))
+        statements.extend(
+            [
+                sa.DDL(f'DROP TYPE IF EXISTS "{SCHEMA}"."appt_status_enum"'),
+                sa.DDL(f'DROP TYPE IF EXISTS "{SCHEMA}"."role_enum"'),
+                sa.DDL(f'DROP EXTENSION IF EXISTS "{VECTOR_EXTENSION}"'),
+                sa.DDL(f'DROP EXTENSION IF EXISTS "{BTREE_GIST_EXTENSION}"'),
+            ]
+        )
+
+    _execute_ddl_batch(ctx, statements)
 
     logger.info("Baseline downgrade complete", extra={"schema": SCHEMA})
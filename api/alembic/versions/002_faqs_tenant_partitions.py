@@ -0,0 +1,190 @@
+"""Partition faqs by tenant hash with a local HNSW index per partition."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "002_faqs_tenant_partitions"
+down_revision = "001_initial_squashed"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+FAQ_PARTITION_COUNT = 16
+FAQ_HNSW_INDEX = "ix_faqs_embedding_hnsw"
+FAQ_TENANT_INDEX = "ix_faqs_tenant_id"
+FAQ_COLUMNS = "id, tenant_id, question, answer, embedding"
+
+logger = get_logger("alembic.002_faqs_tenant_partitions")
+
+
+def _is_partitioned(bind: sa.engine.Connection, table_name: str) -> bool:
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT c.relkind = 'p'
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relname = :table_name AND n.nspname = :schema_name
+            """
+        ),
+        {"table_name": table_name, "schema_name": SCHEMA},
+    )
+    return bool(result.scalar())
+
+
+def _faq_id_sequence(bind: sa.engine.Connection) -> str:
+    """Return the sequence backing ``faqs.id``, creating one if it went missing."""
+
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence(:table_name, 'id')"),
+        {"table_name": f"{SCHEMA}.faqs"},
+    ).scalar()
+    if sequence:
+        return str(sequence)
+
+    sequence = f"{SCHEMA}.faqs_id_seq"
+    logger.info("Creating missing FAQ id sequence", extra={"sequence": sequence})
+    op.execute(sa.text(f"CREATE SEQUENCE IF NOT EXISTS {sequence}"))
+    op.execute(
+        sa.text(
+            f"SELECT setval('{sequence}', COALESCE((SELECT max(id) FROM {SCHEMA}.faqs), 0) + 1, false)"
+        )
+    )
+    return sequence
+
+
+def _swap_faqs_table(new_table: str, sequence: str) -> None:
+    """Copy rows into ``new_table``, drop the old ``faqs`` and rename into place."""
+
+    op.execute(
+        sa.text(
+            f"""
+            INSERT INTO {SCHEMA}.{new_table} ({FAQ_COLUMNS})
+            SELECT {FAQ_COLUMNS} FROM {SCHEMA}.faqs
+            """
+        )
+    )
+    op.execute(sa.text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+    op.execute(sa.text(f"DROP TABLE {SCHEMA}.faqs"))
+    op.execute(sa.text(f"ALTER TABLE {SCHEMA}.{new_table} RENAME TO faqs"))
+    op.execute(
+        sa.text(
+            f"ALTER TABLE {SCHEMA}.faqs RENAME CONSTRAINT {new_table}_pkey TO faqs_pkey"
+        )
+    )
+    op.execute(
+        sa.text(
+            f"ALTER TABLE {SCHEMA}.faqs "
+            f"RENAME CONSTRAINT {new_table}_tenant_id_fkey TO faqs_tenant_id_fkey"
+        )
+    )
+    op.execute(sa.text(f"ALTER SEQUENCE {sequence} OWNED BY {SCHEMA}.faqs.id"))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping FAQ partitioning on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    if _is_partitioned(bind, "faqs"):
+        logger.info(
+            "FAQ table already partitioned; skipping",
+            extra={"table": f"{SCHEMA}.faqs"},
+        )
+        return
+
+    sequence = _faq_id_sequence(bind)
+    logger.info(
+        "Partitioning FAQ table by tenant hash",
+        extra={"table": f"{SCHEMA}.faqs", "partitions": FAQ_PARTITION_COUNT},
+    )
+    op.execute(
+        sa.text(
+            f"""
+            CREATE TABLE {SCHEMA}.faqs_partitioned (
+                id INTEGER NOT NULL DEFAULT nextval('{sequence}'),
+                tenant_id VARCHAR(255) NOT NULL,
+                question VARCHAR(500) NOT NULL,
+                answer TEXT NOT NULL,
+                embedding vector(1536),
+                CONSTRAINT faqs_partitioned_pkey PRIMARY KEY (id, tenant_id),
+                CONSTRAINT faqs_partitioned_tenant_id_fkey FOREIGN KEY (tenant_id)
+                    REFERENCES {SCHEMA}.tenants (id) ON DELETE CASCADE
+            ) PARTITION BY HASH (tenant_id)
+            """
+        )
+    )
+    for remainder in range(FAQ_PARTITION_COUNT):
+        op.execute(
+            sa.text(
+                f"""
+                CREATE TABLE {SCHEMA}.faqs_p{remainder}
+                PARTITION OF {SCHEMA}.faqs_partitioned
+                FOR VALUES WITH (MODULUS {FAQ_PARTITION_COUNT}, REMAINDER {remainder})
+                """
+            )
+        )
+
+    _swap_faqs_table("faqs_partitioned", sequence)
+
+    logger.info("Creating per-partition HNSW index", extra={"index": FAQ_HNSW_INDEX})
+    op.execute(
+        sa.text(
+            f"""
+            CREATE INDEX IF NOT EXISTS {FAQ_HNSW_INDEX}
+            ON {SCHEMA}.faqs USING hnsw (embedding vector_cosine_ops)
+            """
+        )
+    )
+
+    logger.info("FAQ partitioning complete", extra={"table": f"{SCHEMA}.faqs"})
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    if not _is_partitioned(bind, "faqs"):
+        logger.info(
+            "FAQ table not partitioned; skipping downgrade",
+            extra={"table": f"{SCHEMA}.faqs"},
+        )
+        return
+
+    sequence = _faq_id_sequence(bind)
+    logger.info("Restoring unpartitioned FAQ table", extra={"table": f"{SCHEMA}.faqs"})
+    op.execute(
+        sa.text(
+            f"""
+            CREATE TABLE {SCHEMA}.faqs_unpartitioned (
+                id INTEGER NOT NULL DEFAULT nextval('{sequence}'),
+                tenant_id VARCHAR(255) NOT NULL,
+                question VARCHAR(500) NOT NULL,
+                answer TEXT NOT NULL,
+                embedding vector(1536),
+                CONSTRAINT faqs_unpartitioned_pkey PRIMARY KEY (id),
+                CONSTRAINT faqs_unpartitioned_tenant_id_fkey FOREIGN KEY (tenant_id)
+                    REFERENCES {SCHEMA}.tenants (id) ON DELETE CASCADE
+            )
+            """
+        )
+    )
+
+    _swap_faqs_table("faqs_unpartitioned", sequence)
+
+    op.execute(
+        sa.text(
+            f"CREATE INDEX IF NOT EXISTS {FAQ_TENANT_INDEX} ON {SCHEMA}.faqs (tenant_id)"
+        )
+    )
+
+    logger.info("FAQ partitioning reverted", extra={"table": f"{SCHEMA}.faqs"})
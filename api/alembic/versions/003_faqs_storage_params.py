@@ -0,0 +1,82 @@
+"""Tune FAQ heap storage for HOT updates and faster autovacuum."""
+
+from __future__ import annotations
+
+from typing import List
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "003_faqs_storage_params"
+down_revision = "002_faqs_tenant_partitions"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+FAQ_STORAGE_PARAMS = "fillfactor = 90, autovacuum_vacuum_scale_factor = 0.05"
+FAQ_STORAGE_PARAM_NAMES = "fillfactor, autovacuum_vacuum_scale_factor"
+
+logger = get_logger("alembic.003_faqs_storage_params")
+
+
+def _storage_targets(bind: sa.engine.Connection, table_name: str) -> List[str]:
+    """Return the relations that carry heap storage for ``table_name``.
+
+    Partitioned parents have no storage of their own, so their leaf
+    partitions are returned instead.
+    """
+
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_namespace n ON n.oid = parent.relnamespace
+            WHERE parent.relname = :table_name AND n.nspname = :schema_name
+            ORDER BY child.relname
+            """
+        ),
+        {"table_name": table_name, "schema_name": SCHEMA},
+    )
+    partitions = [str(row[0]) for row in result]
+    return partitions or [table_name]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping FAQ storage parameters on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    for relation in _storage_targets(bind, "faqs"):
+        logger.info(
+            "Setting FAQ storage parameters",
+            extra={"table": f"{SCHEMA}.{relation}", "params": FAQ_STORAGE_PARAMS},
+        )
+        op.execute(
+            sa.text(f"ALTER TABLE {SCHEMA}.{relation} SET ({FAQ_STORAGE_PARAMS})")
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for relation in _storage_targets(bind, "faqs"):
+        logger.info(
+            "Resetting FAQ storage parameters",
+            extra={"table": f"{SCHEMA}.{relation}"},
+        )
+        op.execute(
+            sa.text(
+                f"ALTER TABLE {SCHEMA}.{relation} RESET ({FAQ_STORAGE_PARAM_NAMES})"
+            )
+        )
@@ -0,0 +1,72 @@
+"""Add a binary-quantized HNSW index on FAQ embeddings for coarse ranking."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "004_faqs_binary_quantized_index"
+down_revision = "003_faqs_storage_params"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+FAQ_BQ_INDEX = "ix_faqs_embedding_bq_hnsw"
+EMBEDDING_DIMENSIONS = 1536
+MIN_PGVECTOR_VERSION: Tuple[int, ...] = (0, 7, 0)
+
+logger = get_logger("alembic.004_faqs_binary_quantized_index")
+
+
+def _pgvector_version(bind: sa.engine.Connection) -> Tuple[int, ...]:
+    raw = bind.execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not raw:
+        return ()
+    return tuple(int(part) for part in str(raw).split(".") if part.isdigit())
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping binary-quantized index on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    version = _pgvector_version(bind)
+    if version < MIN_PGVECTOR_VERSION:
+        logger.warning(
+            "pgvector too old for binary_quantize; skipping index",
+            extra={
+                "index": FAQ_BQ_INDEX,
+                "pgvector_version": ".".join(map(str, version)),
+            },
+        )
+        return
+
+    logger.info("Creating binary-quantized HNSW index", extra={"index": FAQ_BQ_INDEX})
+    op.execute(
+        sa.text(
+            f"""
+            CREATE INDEX IF NOT EXISTS {FAQ_BQ_INDEX}
+            ON {SCHEMA}.faqs
+            USING hnsw ((binary_quantize(embedding)::bit({EMBEDDING_DIMENSIONS})) bit_hamming_ops)
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    logger.info("Dropping binary-quantized HNSW index", extra={"index": FAQ_BQ_INDEX})
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{FAQ_BQ_INDEX}"))
@@ -0,0 +1,101 @@
+"""Normalize FAQ embeddings and switch the HNSW index to inner-product ops."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "005_faqs_inner_product_hnsw"
+down_revision = "004_faqs_binary_quantized_index"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+FAQ_COSINE_INDEX = "ix_faqs_embedding_hnsw"
+FAQ_IP_INDEX = "ix_faqs_embedding_ip_hnsw"
+MIN_PGVECTOR_VERSION: Tuple[int, ...] = (0, 7, 0)
+
+logger = get_logger("alembic.005_faqs_inner_product_hnsw")
+
+
+def _pgvector_version(bind: sa.engine.Connection) -> Tuple[int, ...]:
+    raw = bind.execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not raw:
+        return ()
+    return tuple(int(part) for part in str(raw).split(".") if part.isdigit())
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping inner-product HNSW switch on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    version = _pgvector_version(bind)
+    if version < MIN_PGVECTOR_VERSION:
+        # models.FAQ and retrieval.py assume unit vectors behind an
+        # inner-product index; leaving the cosine setup in place would rank
+        # raw vectors by inner product without any index.
+        installed = ".".join(map(str, version)) or "none"
+        message = (
+            "pgvector >= 0.7.0 is required to normalize FAQ embeddings "
+            f"(installed: {installed}). "
+            "Upgrade pgvector and run ALTER EXTENSION vector UPDATE."
+        )
+        logger.error(message, extra={"pgvector_version": installed})
+        raise RuntimeError(message)
+
+    logger.info("Normalizing stored FAQ embeddings", extra={"table": f"{SCHEMA}.faqs"})
+    op.execute(
+        sa.text(
+            f"""
+            UPDATE {SCHEMA}.faqs
+            SET embedding = l2_normalize(embedding)
+            WHERE embedding IS NOT NULL
+            """
+        )
+    )
+
+    logger.info(
+        "Replacing cosine HNSW index with inner-product index",
+        extra={"dropped": FAQ_COSINE_INDEX, "created": FAQ_IP_INDEX},
+    )
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{FAQ_COSINE_INDEX}"))
+    op.execute(
+        sa.text(
+            f"""
+            CREATE INDEX IF NOT EXISTS {FAQ_IP_INDEX}
+            ON {SCHEMA}.faqs USING hnsw (embedding vector_ip_ops)
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    # Normalized vectors stay valid for cosine search, so only the index changes.
+    logger.info(
+        "Restoring cosine HNSW index",
+        extra={"dropped": FAQ_IP_INDEX, "created": FAQ_COSINE_INDEX},
+    )
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{FAQ_IP_INDEX}"))
+    op.execute(
+        sa.text(
+            f"""
+            CREATE INDEX IF NOT EXISTS {FAQ_COSINE_INDEX}
+            ON {SCHEMA}.faqs USING hnsw (embedding vector_cosine_ops)
+            """
+        )
+    )
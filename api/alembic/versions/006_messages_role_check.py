@@ -0,0 +1,124 @@
+"""Store messages.role as TEXT guarded by a CHECK constraint instead of role_enum."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "006_messages_role_check"
+down_revision = "005_faqs_inner_product_hnsw"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+ROLE_ENUM = "role_enum"
+ROLE_CHECK = "ck_messages_role"
+ROLE_VALUES = ("inbound", "assistant")
+ROLE_VALUES_SQL = ", ".join(f"'{value}'" for value in ROLE_VALUES)
+
+logger = get_logger("alembic.006_messages_role_check")
+
+
+def _role_column_type(bind: sa.engine.Connection) -> Optional[str]:
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT udt_name
+            FROM information_schema.columns
+            WHERE table_schema = :schema_name
+              AND table_name = 'messages'
+              AND column_name = 'role'
+            """
+        ),
+        {"schema_name": SCHEMA},
+    )
+    value = result.scalar()
+    return str(value) if value is not None else None
+
+
+def _constraint_exists(bind: sa.engine.Connection, name: str) -> bool:
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT 1
+            FROM pg_constraint c
+            JOIN pg_namespace n ON n.oid = c.connamespace
+            WHERE c.conname = :name AND n.nspname = :schema_name
+            """
+        ),
+        {"name": name, "schema_name": SCHEMA},
+    )
+    return result.scalar() is not None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping role CHECK conversion on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    if _role_column_type(bind) == ROLE_ENUM:
+        logger.info(
+            "Converting messages.role to TEXT", extra={"table": f"{SCHEMA}.messages"}
+        )
+        op.execute(
+            sa.text(
+                f"ALTER TABLE {SCHEMA}.messages ALTER COLUMN role TYPE TEXT USING role::text"
+            )
+        )
+
+    if not _constraint_exists(bind, ROLE_CHECK):
+        # NOT VALID + VALIDATE keeps the scan under SHARE UPDATE EXCLUSIVE, so
+        # future value additions can follow the same non-blocking pattern.
+        logger.info("Adding role CHECK constraint", extra={"constraint": ROLE_CHECK})
+        op.execute(
+            sa.text(
+                f"ALTER TABLE {SCHEMA}.messages ADD CONSTRAINT {ROLE_CHECK} "
+                f"CHECK (role IN ({ROLE_VALUES_SQL})) NOT VALID"
+            )
+        )
+        op.execute(
+            sa.text(f"ALTER TABLE {SCHEMA}.messages VALIDATE CONSTRAINT {ROLE_CHECK}")
+        )
+
+    op.execute(sa.text(f'DROP TYPE IF EXISTS "{SCHEMA}"."{ROLE_ENUM}"'))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    logger.info(
+        "Restoring role_enum on messages.role", extra={"table": f"{SCHEMA}.messages"}
+    )
+    op.execute(
+        sa.text(
+            f"""
+            DO $$
+            BEGIN
+                CREATE TYPE "{SCHEMA}"."{ROLE_ENUM}" AS ENUM ({ROLE_VALUES_SQL});
+            EXCEPTION
+                WHEN duplicate_object THEN NULL;
+            END
+            $$;
+            """
+        )
+    )
+    op.execute(
+        sa.text(f"ALTER TABLE {SCHEMA}.messages DROP CONSTRAINT IF EXISTS {ROLE_CHECK}")
+    )
+    if _role_column_type(bind) != ROLE_ENUM:
+        op.execute(
+            sa.text(
+                f'ALTER TABLE {SCHEMA}.messages ALTER COLUMN role TYPE "{SCHEMA}"."{ROLE_ENUM}" '
+                f'USING role::"{SCHEMA}"."{ROLE_ENUM}"'
+            )
+        )
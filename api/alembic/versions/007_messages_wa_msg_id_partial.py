@@ -0,0 +1,83 @@
+"""Replace the messages.wa_msg_id unique constraint with a partial unique index."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "007_messages_wa_msg_id_partial"
+down_revision = "006_messages_role_check"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+WA_MSG_ID_CONSTRAINT = "uq_messages_wa_msg_id"
+WA_MSG_ID_INDEX = "ix_messages_wa_msg_id_nn"
+
+logger = get_logger("alembic.007_messages_wa_msg_id_partial")
+
+
+def _constraint_exists(bind: sa.engine.Connection, name: str) -> bool:
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT 1
+            FROM pg_constraint c
+            JOIN pg_namespace n ON n.oid = c.connamespace
+            WHERE c.conname = :name AND n.nspname = :schema_name
+            """
+        ),
+        {"name": name, "schema_name": SCHEMA},
+    )
+    return result.scalar() is not None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping partial wa_msg_id index on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    # Build the partial index first so uniqueness is enforced throughout.
+    logger.info("Creating partial unique index", extra={"index": WA_MSG_ID_INDEX})
+    op.execute(
+        sa.text(
+            f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS {WA_MSG_ID_INDEX}
+            ON {SCHEMA}.messages (wa_msg_id)
+            WHERE wa_msg_id IS NOT NULL
+            """
+        )
+    )
+    logger.info(
+        "Dropping full unique constraint", extra={"constraint": WA_MSG_ID_CONSTRAINT}
+    )
+    op.execute(
+        sa.text(
+            f"ALTER TABLE {SCHEMA}.messages DROP CONSTRAINT IF EXISTS {WA_MSG_ID_CONSTRAINT}"
+        )
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    if not _constraint_exists(bind, WA_MSG_ID_CONSTRAINT):
+        logger.info(
+            "Restoring full unique constraint",
+            extra={"constraint": WA_MSG_ID_CONSTRAINT},
+        )
+        op.execute(
+            sa.text(
+                f"ALTER TABLE {SCHEMA}.messages "
+                f"ADD CONSTRAINT {WA_MSG_ID_CONSTRAINT} UNIQUE (wa_msg_id)"
+            )
+        )
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{WA_MSG_ID_INDEX}"))
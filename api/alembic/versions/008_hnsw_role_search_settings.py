@@ -0,0 +1,89 @@
+"""Persist HNSW search settings on the application role."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "008_hnsw_role_search_settings"
+down_revision = "007_messages_wa_msg_id_partial"
+branch_labels = None
+depends_on = None
+
+HNSW_EF_SEARCH = 100
+HNSW_ITERATIVE_SCAN = "strict_order"
+ITERATIVE_SCAN_MIN_VERSION: Tuple[int, ...] = (0, 8, 0)
+
+logger = get_logger("alembic.008_hnsw_role_search_settings")
+
+
+def _pgvector_version(bind: sa.engine.Connection) -> Tuple[int, ...]:
+    raw = bind.execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not raw:
+        return ()
+    return tuple(int(part) for part in str(raw).split(".") if part.isdigit())
+
+
+def _alter_current_role(clause: str) -> None:
+    # Managed providers may deny ALTER ROLE; a missing default only costs
+    # recall, so log it on the server instead of failing the deploy.
+    op.execute(
+        sa.text(
+            f"""
+            DO $$
+            BEGIN
+                EXECUTE format('ALTER ROLE %I {clause}', current_user);
+            EXCEPTION
+                WHEN insufficient_privilege THEN
+                    RAISE NOTICE 'Skipping ALTER ROLE {clause}: insufficient privilege';
+            END
+            $$;
+            """
+        )
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping HNSW role settings on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    # Role defaults apply to every new pooled connection, so the hot query
+    # path never has to issue SET before a vector search.
+    logger.info("Setting role hnsw.ef_search", extra={"ef_search": HNSW_EF_SEARCH})
+    _alter_current_role(f"SET hnsw.ef_search = {HNSW_EF_SEARCH}")
+
+    version = _pgvector_version(bind)
+    if version >= ITERATIVE_SCAN_MIN_VERSION:
+        # Tenant filters run after the graph walk; iterative scans keep
+        # widening the search until enough rows survive the filter.
+        logger.info(
+            "Setting role hnsw.iterative_scan",
+            extra={"iterative_scan": HNSW_ITERATIVE_SCAN},
+        )
+        _alter_current_role(f"SET hnsw.iterative_scan = {HNSW_ITERATIVE_SCAN}")
+    else:
+        logger.info(
+            "pgvector lacks iterative scans; leaving default",
+            extra={"pgvector_version": ".".join(map(str, version))},
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    logger.info("Resetting role HNSW settings")
+    _alter_current_role("RESET hnsw.ef_search")
+    _alter_current_role("RESET hnsw.iterative_scan")
@@ -0,0 +1,141 @@
+"""Store FAQ embeddings as halfvec(1536) and rebuild their HNSW indexes."""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "009_faqs_halfvec_embeddings"
+down_revision = "008_hnsw_role_search_settings"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+EMBEDDING_DIMENSIONS = 1536
+FAQ_IP_INDEX = "ix_faqs_embedding_ip_hnsw"
+FAQ_BQ_INDEX = "ix_faqs_embedding_bq_hnsw"
+HNSW_PARAMS = "m = 16, ef_construction = 64"
+MIN_PGVECTOR_VERSION: Tuple[int, ...] = (0, 7, 0)
+
+logger = get_logger("alembic.009_faqs_halfvec_embeddings")
+
+
+def _pgvector_version(bind: sa.engine.Connection) -> Tuple[int, ...]:
+    raw = bind.execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not raw:
+        return ()
+    return tuple(int(part) for part in str(raw).split(".") if part.isdigit())
+
+
+def _embedding_type(bind: sa.engine.Connection) -> Optional[str]:
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT udt_name
+            FROM information_schema.columns
+            WHERE table_schema = :schema_name
+              AND table_name = 'faqs'
+              AND column_name = 'embedding'
+            """
+        ),
+        {"schema_name": SCHEMA},
+    )
+    value = result.scalar()
+    return str(value) if value is not None else None
+
+
+def _retype_embeddings(column_type: str, ops_prefix: str) -> None:
+    """Drop the HNSW indexes, change the column type and rebuild them.
+
+    HNSW indexes are bound to their operator class, so they cannot survive
+    the type change and would otherwise be rebuilt twice.
+    """
+
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{FAQ_BQ_INDEX}"))
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{FAQ_IP_INDEX}"))
+    op.execute(
+        sa.text(
+            f"""
+            ALTER TABLE {SCHEMA}.faqs
+            ALTER COLUMN embedding TYPE {column_type}
+            USING embedding::{column_type}
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            f"""
+            CREATE INDEX IF NOT EXISTS {FAQ_IP_INDEX}
+            ON {SCHEMA}.faqs USING hnsw (embedding {ops_prefix}_ip_ops)
+            WITH ({HNSW_PARAMS})
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            f"""
+            CREATE INDEX IF NOT EXISTS {FAQ_BQ_INDEX}
+            ON {SCHEMA}.faqs
+            USING hnsw ((binary_quantize(embedding)::bit({EMBEDDING_DIMENSIONS})) bit_hamming_ops)
+            """
+        )
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping halfvec conversion on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    version = _pgvector_version(bind)
+    if version < MIN_PGVECTOR_VERSION:
+        # models.FAQ declares HALFVEC and retrieval.py casts queries to it, so
+        # keeping vector columns would leave the ORM out of step with the table.
+        installed = ".".join(map(str, version)) or "none"
+        message = (
+            "pgvector >= 0.7.0 is required to store FAQ embeddings as halfvec "
+            f"(installed: {installed}). "
+            "Upgrade pgvector and run ALTER EXTENSION vector UPDATE."
+        )
+        logger.error(message, extra={"pgvector_version": installed})
+        raise RuntimeError(message)
+
+    if _embedding_type(bind) == "halfvec":
+        logger.info(
+            "FAQ embeddings already halfvec; skipping",
+            extra={"table": f"{SCHEMA}.faqs"},
+        )
+        return
+
+    logger.info(
+        "Converting FAQ embeddings to halfvec",
+        extra={"table": f"{SCHEMA}.faqs", "dimensions": EMBEDDING_DIMENSIONS},
+    )
+    _retype_embeddings(f"halfvec({EMBEDDING_DIMENSIONS})", "halfvec")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    if _embedding_type(bind) != "halfvec":
+        logger.info(
+            "FAQ embeddings not halfvec; skipping", extra={"table": f"{SCHEMA}.faqs"}
+        )
+        return
+
+    logger.info(
+        "Restoring full-precision FAQ embeddings", extra={"table": f"{SCHEMA}.faqs"}
+    )
+    _retype_embeddings(f"vector({EMBEDDING_DIMENSIONS})", "vector")
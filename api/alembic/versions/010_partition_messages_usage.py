@@ -0,0 +1,363 @@
+"""Partition messages by tenant hash and usage by monthly msg_ts ranges."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import List, Optional, Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "010_partition_messages_usage"
+down_revision = "009_faqs_halfvec_embeddings"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+MESSAGES_PARTITION_COUNT = 16
+USAGE_MONTHS_AHEAD = 3
+MESSAGE_ROLE_CHECK = "ck_messages_role"
+MESSAGE_ROLE_VALUES_SQL = "'inbound', 'assistant'"
+WA_MSG_ID_INDEX = "ix_messages_wa_msg_id_nn"
+MESSAGES_COLUMNS = "id, tenant_id, wa_msg_id, role, text, tokens, ts"
+USAGE_COLUMNS = (
+    "id, tenant_id, direction, tokens, msg_ts, model, "
+    "prompt_tokens, completion_tokens, total_tokens, trace_id"
+)
+# Baseline usage indexes. The upgrade does not rebuild them on the partitioned
+# table because 012, 013 and 017 replace or drop every one; the downgrade puts
+# them back on the plain table the baseline expects.
+BASELINE_USAGE_INDEXES: Tuple[Tuple[str, str], ...] = (
+    ("ix_usage_tenant_id", "tenant_id"),
+    ("ix_usage_tenant_id_msg_ts", "tenant_id, msg_ts"),
+    ("ix_usage_tenant_id_id", "tenant_id, id"),
+)
+
+logger = get_logger("alembic.010_partition_messages_usage")
+
+
+def _messages_ddl(table_name: str, sequence: str, partitioned: bool) -> str:
+    primary_key = "id, tenant_id" if partitioned else "id"
+    suffix = " PARTITION BY HASH (tenant_id)" if partitioned else ""
+    return f"""
+        CREATE TABLE {SCHEMA}.{table_name} (
+            id INTEGER NOT NULL DEFAULT nextval('{sequence}'),
+            tenant_id VARCHAR(255) NOT NULL,
+            wa_msg_id VARCHAR(255),
+            role TEXT NOT NULL,
+            text TEXT NOT NULL,
+            tokens INTEGER,
+            ts TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT {table_name}_pkey PRIMARY KEY ({primary_key}),
+            CONSTRAINT {table_name}_tenant_id_fkey FOREIGN KEY (tenant_id)
+                REFERENCES {SCHEMA}.tenants (id) ON DELETE CASCADE,
+            CONSTRAINT {table_name}_role_check
+                CHECK (role IN ({MESSAGE_ROLE_VALUES_SQL}))
+        ){suffix}
+        """
+
+
+def _usage_ddl(table_name: str, sequence: str, partitioned: bool) -> str:
+    primary_key = "id, msg_ts" if partitioned else "id"
+    suffix = " PARTITION BY RANGE (msg_ts)" if partitioned else ""
+    return f"""
+        CREATE TABLE {SCHEMA}.{table_name} (
+            id INTEGER NOT NULL DEFAULT nextval('{sequence}'),
+            tenant_id VARCHAR(255) NOT NULL,
+            direction VARCHAR(64),
+            tokens INTEGER,
+            msg_ts TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            model VARCHAR(255),
+            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+            completion_tokens INTEGER NOT NULL DEFAULT 0,
+            total_tokens INTEGER NOT NULL DEFAULT 0,
+            trace_id VARCHAR(255),
+            CONSTRAINT {table_name}_pkey PRIMARY KEY ({primary_key}),
+            CONSTRAINT {table_name}_tenant_id_fkey FOREIGN KEY (tenant_id)
+                REFERENCES {SCHEMA}.tenants (id) ON DELETE CASCADE
+        ){suffix}
+        """
+
+
+def _is_partitioned(bind: sa.engine.Connection, table_name: str) -> bool:
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT c.relkind = 'p'
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relname = :table_name AND n.nspname = :schema_name
+            """
+        ),
+        {"table_name": table_name, "schema_name": SCHEMA},
+    )
+    return bool(result.scalar())
+
+
+def _id_sequence(bind: sa.engine.Connection, table_name: str) -> str:
+    """Return the sequence backing ``<table>.id``, creating one if it went missing."""
+
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence(:table_name, 'id')"),
+        {"table_name": f"{SCHEMA}.{table_name}"},
+    ).scalar()
+    if sequence:
+        return str(sequence)
+
+    sequence = f"{SCHEMA}.{table_name}_id_seq"
+    logger.info("Creating missing id sequence", extra={"sequence": sequence})
+    op.execute(sa.text(f"CREATE SEQUENCE IF NOT EXISTS {sequence}"))
+    op.execute(
+        sa.text(
+            f"SELECT setval('{sequence}', "
+            f"COALESCE((SELECT max(id) FROM {SCHEMA}.{table_name}), 0) + 1, false)"
+        )
+    )
+    return sequence
+
+
+def _swap_table(
+    table_name: str,
+    new_table: str,
+    columns: str,
+    sequence: str,
+    constraints: List[Tuple[str, str]],
+) -> None:
+    """Copy rows into ``new_table``, drop ``table_name`` and rename into place."""
+
+    op.execute(
+        sa.text(
+            f"""
+            INSERT INTO {SCHEMA}.{new_table} ({columns})
+            SELECT {columns} FROM {SCHEMA}.{table_name}
+            """
+        )
+    )
+    op.execute(sa.text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+    op.execute(sa.text(f"DROP TABLE {SCHEMA}.{table_name}"))
+    op.execute(sa.text(f"ALTER TABLE {SCHEMA}.{new_table} RENAME TO {table_name}"))
+    for old_name, new_name in constraints:
+        op.execute(
+            sa.text(
+                f"ALTER TABLE {SCHEMA}.{table_name} RENAME CONSTRAINT {old_name} TO {new_name}"
+            )
+        )
+    op.execute(sa.text(f"ALTER SEQUENCE {sequence} OWNED BY {SCHEMA}.{table_name}.id"))
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _usage_partition(month: date) -> Tuple[str, date, date]:
+    """Return the partition name and ``[from, to)`` bounds for ``month``.
+
+    ``jobs.usage_partitions`` creates later months under the same names.
+    """
+
+    return f"usage_{month:%Y_%m}", month, _add_months(month, 1)
+
+
+def _usage_month_bounds(bind: sa.engine.Connection) -> Tuple[date, date]:
+    """Return the first month holding usage rows and the month after the horizon."""
+
+    row = bind.execute(
+        sa.text(
+            f"""
+            SELECT
+                date_trunc('month', min(msg_ts))::date,
+                date_trunc('month', now())::date
+            FROM {SCHEMA}.usage
+            """
+        )
+    ).one()
+    oldest: Optional[date] = row[0]
+    current: date = row[1]
+    first = min(oldest, current) if oldest is not None else current
+    return first, _add_months(current, USAGE_MONTHS_AHEAD + 1)
+
+
+def _partition_messages(bind: sa.engine.Connection) -> None:
+    if _is_partitioned(bind, "messages"):
+        logger.info(
+            "Messages already partitioned; skipping",
+            extra={"table": f"{SCHEMA}.messages"},
+        )
+        return
+
+    sequence = _id_sequence(bind, "messages")
+    logger.info(
+        "Partitioning messages by tenant hash",
+        extra={"table": f"{SCHEMA}.messages", "partitions": MESSAGES_PARTITION_COUNT},
+    )
+    op.execute(
+        sa.text(_messages_ddl("messages_partitioned", sequence, partitioned=True))
+    )
+    for remainder in range(MESSAGES_PARTITION_COUNT):
+        op.execute(
+            sa.text(
+                f"""
+                CREATE TABLE {SCHEMA}.messages_p{remainder}
+                PARTITION OF {SCHEMA}.messages_partitioned
+                FOR VALUES WITH (MODULUS {MESSAGES_PARTITION_COUNT}, REMAINDER {remainder})
+                """
+            )
+        )
+
+    _swap_table(
+        "messages",
+        "messages_partitioned",
+        MESSAGES_COLUMNS,
+        sequence,
+        [
+            ("messages_partitioned_pkey", "messages_pkey"),
+            ("messages_partitioned_tenant_id_fkey", "messages_tenant_id_fkey"),
+            ("messages_partitioned_role_check", MESSAGE_ROLE_CHECK),
+        ],
+    )
+
+    # Unique indexes on a partitioned table must contain the partition key.
+    op.execute(
+        sa.text(
+            f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS {WA_MSG_ID_INDEX}
+            ON {SCHEMA}.messages (wa_msg_id, tenant_id)
+            WHERE wa_msg_id IS NOT NULL
+            """
+        )
+    )
+    # ix_messages_tenant_id is not rebuilt: 012 adds (tenant_id, ts) and 013
+    # drops the single-column index, so building it here would be thrown away.
+
+
+def _partition_usage(bind: sa.engine.Connection) -> None:
+    if _is_partitioned(bind, "usage"):
+        logger.info(
+            "Usage already partitioned; skipping", extra={"table": f"{SCHEMA}.usage"}
+        )
+        return
+
+    sequence = _id_sequence(bind, "usage")
+    first, horizon = _usage_month_bounds(bind)
+    logger.info(
+        "Partitioning usage by month",
+        extra={
+            "table": f"{SCHEMA}.usage",
+            "from": first.isoformat(),
+            "to": horizon.isoformat(),
+        },
+    )
+    op.execute(sa.text(_usage_ddl("usage_partitioned", sequence, partitioned=True)))
+    month = first
+    while month < horizon:
+        partition, start, following = _usage_partition(month)
+        op.execute(
+            sa.text(
+                f"""
+                CREATE TABLE {SCHEMA}.{partition}
+                PARTITION OF {SCHEMA}.usage_partitioned
+                FOR VALUES FROM ('{start.isoformat()}') TO ('{following.isoformat()}')
+                """
+            )
+        )
+        month = following
+    op.execute(
+        sa.text(
+            f"CREATE TABLE {SCHEMA}.usage_default PARTITION OF {SCHEMA}.usage_partitioned DEFAULT"
+        )
+    )
+
+    _swap_table(
+        "usage",
+        "usage_partitioned",
+        USAGE_COLUMNS,
+        sequence,
+        [
+            ("usage_partitioned_pkey", "usage_pkey"),
+            ("usage_partitioned_tenant_id_fkey", "usage_tenant_id_fkey"),
+        ],
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping messages/usage partitioning on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    _partition_messages(bind)
+    _partition_usage(bind)
+    logger.info("Messages and usage partitioning complete", extra={"schema": SCHEMA})
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    if _is_partitioned(bind, "messages"):
+        sequence = _id_sequence(bind, "messages")
+        logger.info(
+            "Restoring unpartitioned messages", extra={"table": f"{SCHEMA}.messages"}
+        )
+        op.execute(
+            sa.text(
+                _messages_ddl("messages_unpartitioned", sequence, partitioned=False)
+            )
+        )
+        _swap_table(
+            "messages",
+            "messages_unpartitioned",
+            MESSAGES_COLUMNS,
+            sequence,
+            [
+                ("messages_unpartitioned_pkey", "messages_pkey"),
+                ("messages_unpartitioned_tenant_id_fkey", "messages_tenant_id_fkey"),
+                ("messages_unpartitioned_role_check", MESSAGE_ROLE_CHECK),
+            ],
+        )
+        op.execute(
+            sa.text(
+                f"""
+                CREATE UNIQUE INDEX IF NOT EXISTS {WA_MSG_ID_INDEX}
+                ON {SCHEMA}.messages (wa_msg_id)
+                WHERE wa_msg_id IS NOT NULL
+                """
+            )
+        )
+        op.execute(
+            sa.text(
+                f"CREATE INDEX IF NOT EXISTS ix_messages_tenant_id ON {SCHEMA}.messages (tenant_id)"
+            )
+        )
+
+    if _is_partitioned(bind, "usage"):
+        sequence = _id_sequence(bind, "usage")
+        logger.info("Restoring unpartitioned usage", extra={"table": f"{SCHEMA}.usage"})
+        op.execute(
+            sa.text(_usage_ddl("usage_unpartitioned", sequence, partitioned=False))
+        )
+        _swap_table(
+            "usage",
+            "usage_unpartitioned",
+            USAGE_COLUMNS,
+            sequence,
+            [
+                ("usage_unpartitioned_pkey", "usage_pkey"),
+                ("usage_unpartitioned_tenant_id_fkey", "usage_tenant_id_fkey"),
+            ],
+        )
+        for index_name, columns in BASELINE_USAGE_INDEXES:
+            op.execute(
+                sa.text(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {SCHEMA}.usage ({columns})"
+                )
+            )
+
+    logger.info("Messages and usage partitioning reverted", extra={"schema": SCHEMA})
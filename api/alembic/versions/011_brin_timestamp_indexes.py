@@ -0,0 +1,64 @@
+"""Add BRIN indexes on the append-only usage and message timestamps."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "011_brin_timestamp_indexes"
+down_revision = "010_partition_messages_usage"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+BRIN_PAGES_PER_RANGE = 32
+BRIN_INDEXES: Tuple[Tuple[str, str, str], ...] = (
+    ("ix_usage_msg_ts_brin", "usage", "msg_ts"),
+    ("ix_messages_ts_brin", "messages", "ts"),
+)
+
+logger = get_logger("alembic.011_brin_timestamp_indexes")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping BRIN indexes on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    # Rows arrive in now()-defaulted timestamp order, so heap order tracks the
+    # column and one summary per 32 pages is enough for time-window scans.
+    for index_name, table_name, column in BRIN_INDEXES:
+        logger.info(
+            "Creating BRIN index",
+            extra={"table": f"{SCHEMA}.{table_name}", "index": index_name},
+        )
+        op.execute(
+            sa.text(
+                f"""
+                CREATE INDEX IF NOT EXISTS {index_name}
+                ON {SCHEMA}.{table_name} USING brin ({column})
+                WITH (pages_per_range = {BRIN_PAGES_PER_RANGE})
+                """
+            )
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for index_name, table_name, _column in BRIN_INDEXES:
+        logger.info(
+            "Dropping BRIN index",
+            extra={"table": f"{SCHEMA}.{table_name}", "index": index_name},
+        )
+        op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{index_name}"))
@@ -0,0 +1,78 @@
+"""Add covering (tenant, time) indexes for the usage and message history reads."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "012_covering_tenant_time_indexes"
+down_revision = "011_brin_timestamp_indexes"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+USAGE_COVERING_INDEX = "ix_usage_tenant_ts_cov"
+USAGE_REPLACED_INDEX = "ix_usage_tenant_id_msg_ts"
+USAGE_INCLUDE = "direction, tokens, prompt_tokens, completion_tokens, total_tokens"
+MESSAGES_COVERING_INDEX = "ix_messages_tenant_id_ts"
+MESSAGES_INCLUDE = "tokens"
+
+logger = get_logger("alembic.012_covering_tenant_time_indexes")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping covering indexes on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    # Token totals per tenant/direction/window read only these columns, so the
+    # INCLUDE payload lets them run as index-only scans.
+    logger.info("Creating covering usage index", extra={"index": USAGE_COVERING_INDEX})
+    op.execute(
+        sa.text(
+            f"""
+            CREATE INDEX IF NOT EXISTS {USAGE_COVERING_INDEX}
+            ON {SCHEMA}.usage (tenant_id, msg_ts)
+            INCLUDE ({USAGE_INCLUDE})
+            """
+        )
+    )
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{USAGE_REPLACED_INDEX}"))
+
+    # The admin history view pages a tenant's messages newest first.
+    logger.info(
+        "Creating covering messages index", extra={"index": MESSAGES_COVERING_INDEX}
+    )
+    op.execute(
+        sa.text(
+            f"""
+            CREATE INDEX IF NOT EXISTS {MESSAGES_COVERING_INDEX}
+            ON {SCHEMA}.messages (tenant_id, ts)
+            INCLUDE ({MESSAGES_INCLUDE})
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    logger.info(
+        "Restoring plain usage composite index", extra={"index": USAGE_REPLACED_INDEX}
+    )
+    op.execute(
+        sa.text(
+            f"CREATE INDEX IF NOT EXISTS {USAGE_REPLACED_INDEX} "
+            f"ON {SCHEMA}.usage (tenant_id, msg_ts)"
+        )
+    )
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{USAGE_COVERING_INDEX}"))
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{MESSAGES_COVERING_INDEX}"))
@@ -0,0 +1,67 @@
+"""Drop single-column tenant_id indexes already covered by composite indexes."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "013_drop_redundant_tenant_idx"
+down_revision = "012_covering_tenant_time_indexes"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+# (redundant index, table, composite index whose leading column covers it)
+REDUNDANT_INDEXES: Tuple[Tuple[str, str, str], ...] = (
+    ("ix_usage_tenant_id", "usage", "ix_usage_tenant_ts_cov"),
+    ("ix_messages_tenant_id", "messages", "ix_messages_tenant_id_ts"),
+    ("ix_unavailability_tenant_id", "unavailability", "ix_unavailability_tenant_dates"),
+)
+
+logger = get_logger("alembic.013_drop_redundant_tenant_idx")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping redundant index cleanup on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    for index_name, table_name, covering_index in REDUNDANT_INDEXES:
+        logger.info(
+            "Dropping redundant tenant index",
+            extra={
+                "table": f"{SCHEMA}.{table_name}",
+                "index": index_name,
+                "covered_by": covering_index,
+            },
+        )
+    # One statement drops them all under a single round-trip.
+    index_list = ", ".join(
+        f"{SCHEMA}.{index_name}" for index_name, _, _ in REDUNDANT_INDEXES
+    )
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {index_list}"))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for index_name, table_name, _covering_index in REDUNDANT_INDEXES:
+        logger.info(
+            "Restoring tenant index",
+            extra={"table": f"{SCHEMA}.{table_name}", "index": index_name},
+        )
+        op.execute(
+            sa.text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {SCHEMA}.{table_name} (tenant_id)"
+            )
+        )
@@ -0,0 +1,104 @@
+"""Add partial appointment indexes for the scheduler jobs and a composite owner lookup."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "014_partial_job_contact_indexes"
+down_revision = "013_drop_redundant_tenant_idx"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+# (index, table, columns, predicate)
+PARTIAL_INDEXES: Tuple[Tuple[str, str, str, str], ...] = (
+    (
+        "ix_appointments_pending_starts_at",
+        "appointments",
+        "starts_at",
+        "status = 'pending'",
+    ),
+    (
+        "ix_appointments_reminder_due",
+        "appointments",
+        "starts_at",
+        "status = 'confirmed' AND NOT reminded",
+    ),
+)
+OWNER_CONTACT_INDEX = "ix_owner_contacts_tenant_phone"
+OWNER_CONTACT_REPLACED: Tuple[Tuple[str, str], ...] = (
+    ("ix_owner_contacts_tenant_id", "tenant_id"),
+    ("ix_owner_contacts_phone_number", "phone_number"),
+)
+
+logger = get_logger("alembic.014_partial_job_contact_indexes")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping partial indexes on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    # Only rows still waiting on a job are indexed, so the scheduler scans a
+    # handful of entries instead of the whole appointment history.
+    for index_name, table_name, columns, predicate in PARTIAL_INDEXES:
+        logger.info(
+            "Creating partial index",
+            extra={"table": f"{SCHEMA}.{table_name}", "index": index_name},
+        )
+        op.execute(
+            sa.text(
+                f"""
+                CREATE INDEX IF NOT EXISTS {index_name}
+                ON {SCHEMA}.{table_name} ({columns})
+                WHERE {predicate}
+                """
+            )
+        )
+
+    # Phone numbers are normalized before they are stored and looked up, so a
+    # plain composite matches the owner check without an expression index.
+    logger.info(
+        "Creating owner contact lookup index", extra={"index": OWNER_CONTACT_INDEX}
+    )
+    op.execute(
+        sa.text(
+            f"""
+            CREATE INDEX IF NOT EXISTS {OWNER_CONTACT_INDEX}
+            ON {SCHEMA}.owner_contacts (tenant_id, phone_number)
+            """
+        )
+    )
+    replaced = ", ".join(
+        f"{SCHEMA}.{index_name}" for index_name, _column in OWNER_CONTACT_REPLACED
+    )
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {replaced}"))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for index_name, column in OWNER_CONTACT_REPLACED:
+        op.execute(
+            sa.text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {SCHEMA}.owner_contacts ({column})"
+            )
+        )
+    dropped = [OWNER_CONTACT_INDEX] + [index_name for index_name, *_ in PARTIAL_INDEXES]
+    op.execute(
+        sa.text(
+            "DROP INDEX IF EXISTS "
+            + ", ".join(f"{SCHEMA}.{index_name}" for index_name in dropped)
+        )
+    )
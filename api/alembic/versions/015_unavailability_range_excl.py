@@ -0,0 +1,81 @@
+"""Back the unavailability exclusion constraint with a stored daterange column."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "015_unavailability_range_excl"
+down_revision = "014_partial_job_contact_indexes"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+UNAVAILABILITY_EXCLUSION = "uq_unavailability_owner_dates"
+RANGE_COLUMN = "range"
+RANGE_EXPRESSION = "daterange(starts_on, ends_on, '[]')"
+
+logger = get_logger("alembic.015_unavailability_range_excl")
+
+
+def _replace_constraint(range_operand: str) -> None:
+    op.execute(
+        sa.text(
+            f"""
+            ALTER TABLE {SCHEMA}.unavailability
+            DROP CONSTRAINT IF EXISTS {UNAVAILABILITY_EXCLUSION},
+            ADD CONSTRAINT {UNAVAILABILITY_EXCLUSION}
+            EXCLUDE USING gist (
+                tenant_id WITH =,
+                owner_phone WITH =,
+                {range_operand} WITH &&
+            )
+            """
+        )
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping stored range column on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    # The generated value is computed once per row write; overlap probes then
+    # compare the stored range instead of rebuilding it for each candidate.
+    logger.info(
+        "Adding stored range column",
+        extra={"table": f"{SCHEMA}.unavailability", "column": RANGE_COLUMN},
+    )
+    op.execute(
+        sa.text(
+            f"""
+            ALTER TABLE {SCHEMA}.unavailability
+            ADD COLUMN IF NOT EXISTS "{RANGE_COLUMN}" daterange
+            GENERATED ALWAYS AS ({RANGE_EXPRESSION}) STORED
+            """
+        )
+    )
+    logger.info(
+        "Rebuilding exclusion constraint on stored range",
+        extra={"constraint": UNAVAILABILITY_EXCLUSION},
+    )
+    _replace_constraint(f'"{RANGE_COLUMN}"')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    _replace_constraint(RANGE_EXPRESSION)
+    op.execute(
+        sa.text(
+            f'ALTER TABLE {SCHEMA}.unavailability DROP COLUMN IF EXISTS "{RANGE_COLUMN}"'
+        )
+    )
@@ -0,0 +1,106 @@
+"""Widen messages.id and usage.id (and their sequences) to bigint."""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "016_bigint_message_usage_ids"
+down_revision = "015_unavailability_range_excl"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+WIDENED_TABLES: Tuple[str, ...] = ("messages", "usage")
+# Above this estimate the type change is a long rewrite under an exclusive lock.
+REWRITE_WARN_ROWS = 10_000_000
+
+logger = get_logger("alembic.016_bigint_message_usage_ids")
+
+
+def _id_column_type(bind: sa.engine.Connection, table_name: str) -> Optional[str]:
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT data_type
+            FROM information_schema.columns
+            WHERE table_schema = :schema_name
+              AND table_name = :table_name
+              AND column_name = 'id'
+            """
+        ),
+        {"schema_name": SCHEMA, "table_name": table_name},
+    )
+    value = result.scalar()
+    return str(value) if value is not None else None
+
+
+def _estimated_rows(bind: sa.engine.Connection, table_name: str) -> int:
+    # Partitioned parents keep no statistics of their own, so sum the
+    # planner estimates of the table and every partition under it.
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT COALESCE(sum(GREATEST(c.reltuples, 0)), 0)::bigint
+            FROM pg_partition_tree(CAST(:table_name AS regclass)) t
+            JOIN pg_class c ON c.oid = t.relid
+            """
+        ),
+        {"table_name": f"{SCHEMA}.{table_name}"},
+    )
+    return int(result.scalar() or 0)
+
+
+def _set_id_type(bind: sa.engine.Connection, table_name: str, column_type: str) -> None:
+    # On the partitioned parents this rewrites every partition in one statement.
+    op.execute(
+        sa.text(f"ALTER TABLE {SCHEMA}.{table_name} ALTER COLUMN id TYPE {column_type}")
+    )
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence(:table_name, 'id')"),
+        {"table_name": f"{SCHEMA}.{table_name}"},
+    ).scalar()
+    if sequence:
+        # AS also moves a default MAXVALUE to the new type's limit.
+        op.execute(sa.text(f"ALTER SEQUENCE {sequence} AS {column_type}"))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping bigint id widening on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    for table_name in WIDENED_TABLES:
+        if _id_column_type(bind, table_name) == "bigint":
+            logger.info(
+                "id already bigint; skipping", extra={"table": f"{SCHEMA}.{table_name}"}
+            )
+            continue
+        rows = _estimated_rows(bind, table_name)
+        if rows > REWRITE_WARN_ROWS:
+            logger.warning(
+                "Widening id rewrites a large table while holding an exclusive lock",
+                extra={"table": f"{SCHEMA}.{table_name}", "estimated_rows": rows},
+            )
+        logger.info("Widening id to bigint", extra={"table": f"{SCHEMA}.{table_name}"})
+        _set_id_type(bind, table_name, "bigint")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for table_name in WIDENED_TABLES:
+        logger.info(
+            "Narrowing id to integer", extra={"table": f"{SCHEMA}.{table_name}"}
+        )
+        _set_id_type(bind, table_name, "integer")
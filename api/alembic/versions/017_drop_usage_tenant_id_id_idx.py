@@ -0,0 +1,49 @@
+"""Drop the unused (tenant_id, id) usage index."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "017_drop_usage_tenant_id_id_idx"
+down_revision = "016_bigint_message_usage_ids"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+DROPPED_INDEX = "ix_usage_tenant_id_id"
+COVERING_INDEX = "ix_usage_tenant_ts_cov"
+
+logger = get_logger("alembic.017_drop_usage_tenant_id_id_idx")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping usage index cleanup on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    # Usage reads filter by tenant and window or page by (msg_ts, id), which
+    # the covering (tenant_id, msg_ts) index serves; nothing orders by id alone.
+    logger.info(
+        "Dropping redundant usage index",
+        extra={"index": DROPPED_INDEX, "covered_by": COVERING_INDEX},
+    )
+    op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{DROPPED_INDEX}"))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute(
+        sa.text(
+            f"CREATE INDEX IF NOT EXISTS {DROPPED_INDEX} ON {SCHEMA}.usage (tenant_id, id)"
+        )
+    )
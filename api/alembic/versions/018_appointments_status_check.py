@@ -0,0 +1,168 @@
+"""Store appointments.status as TEXT guarded by a CHECK constraint instead of appt_status_enum."""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import sqlalchemy as sa
+from alembic import op
+
+from logging_utils import get_logger
+
+revision = "018_appointments_status_check"
+down_revision = "017_drop_usage_tenant_id_id_idx"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "public"
+STATUS_ENUM = "appt_status_enum"
+STATUS_CHECK = "ck_appointments_status"
+STATUS_VALUES = ("pending", "confirmed", "cancelled")
+STATUS_VALUES_SQL = ", ".join(f"'{value}'" for value in STATUS_VALUES)
+# Partial indexes whose predicates compare status literals; their stored
+# definitions are bound to the column type, so they are rebuilt around it.
+PARTIAL_INDEXES: Tuple[Tuple[str, str], ...] = (
+    ("ix_appointments_pending_starts_at", "status = 'pending'"),
+    ("ix_appointments_reminder_due", "status = 'confirmed' AND NOT reminded"),
+)
+
+logger = get_logger("alembic.018_appointments_status_check")
+
+
+def _status_column_type(bind: sa.engine.Connection) -> Optional[str]:
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT udt_name
+            FROM information_schema.columns
+            WHERE table_schema = :schema_name
+              AND table_name = 'appointments'
+              AND column_name = 'status'
+            """
+        ),
+        {"schema_name": SCHEMA},
+    )
+    value = result.scalar()
+    return str(value) if value is not None else None
+
+
+def _constraint_exists(bind: sa.engine.Connection, name: str) -> bool:
+    result = bind.execute(
+        sa.text(
+            """
+            SELECT 1
+            FROM pg_constraint c
+            JOIN pg_namespace n ON n.oid = c.connamespace
+            WHERE c.conname = :name AND n.nspname = :schema_name
+            """
+        ),
+        {"name": name, "schema_name": SCHEMA},
+    )
+    return result.scalar() is not None
+
+
+def _drop_partial_indexes() -> None:
+    for index_name, _predicate in PARTIAL_INDEXES:
+        op.execute(sa.text(f"DROP INDEX IF EXISTS {SCHEMA}.{index_name}"))
+
+
+def _create_partial_indexes() -> None:
+    for index_name, predicate in PARTIAL_INDEXES:
+        op.execute(
+            sa.text(
+                f"""
+                CREATE INDEX IF NOT EXISTS {index_name}
+                ON {SCHEMA}.appointments (starts_at)
+                WHERE {predicate}
+                """
+            )
+        )
+
+
+def _set_status_type(type_sql: str) -> None:
+    # The default is an enum-typed literal and must be reset with the column.
+    op.execute(
+        sa.text(f"ALTER TABLE {SCHEMA}.appointments ALTER COLUMN status DROP DEFAULT")
+    )
+    op.execute(
+        sa.text(
+            f"ALTER TABLE {SCHEMA}.appointments "
+            f"ALTER COLUMN status TYPE {type_sql} USING status::text::{type_sql}"
+        )
+    )
+    op.execute(
+        sa.text(
+            f"ALTER TABLE {SCHEMA}.appointments "
+            f"ALTER COLUMN status SET DEFAULT 'pending'"
+        )
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            "Skipping status CHECK conversion on non-PostgreSQL dialect",
+            extra={"dialect": bind.dialect.name},
+        )
+        return
+
+    if _status_column_type(bind) == STATUS_ENUM:
+        logger.info(
+            "Converting appointments.status to TEXT",
+            extra={"table": f"{SCHEMA}.appointments"},
+        )
+        _drop_partial_indexes()
+        _set_status_type("TEXT")
+        _create_partial_indexes()
+
+    if not _constraint_exists(bind, STATUS_CHECK):
+        logger.info(
+            "Adding status CHECK constraint", extra={"constraint": STATUS_CHECK}
+        )
+        op.execute(
+            sa.text(
+                f"ALTER TABLE {SCHEMA}.appointments ADD CONSTRAINT {STATUS_CHECK} "
+                f"CHECK (status IN ({STATUS_VALUES_SQL})) NOT VALID"
+            )
+        )
+        op.execute(
+            sa.text(
+                f"ALTER TABLE {SCHEMA}.appointments VALIDATE CONSTRAINT {STATUS_CHECK}"
+            )
+        )
+
+    op.execute(sa.text(f'DROP TYPE IF EXISTS "{SCHEMA}"."{STATUS_ENUM}"'))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    logger.info(
+        "Restoring appt_status_enum on appointments.status",
+        extra={"table": f"{SCHEMA}.appointments"},
+    )
+    op.execute(
+        sa.text(
+            f"""
+            DO $$
+            BEGIN
+                CREATE TYPE "{SCHEMA}"."{STATUS_ENUM}" AS ENUM ({STATUS_VALUES_SQL});
+            EXCEPTION
+                WHEN duplicate_object THEN NULL;
+            END
+            $$;
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            f"ALTER TABLE {SCHEMA}.appointments DROP CONSTRAINT IF EXISTS {STATUS_CHECK}"
+        )
+    )
+    if _status_column_type(bind) != STATUS_ENUM:
+        _drop_partial_indexes()
+        _set_status_type(f'"{SCHEMA}"."{STATUS_ENUM}"')
+        _create_partial_indexes()
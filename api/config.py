@@ -20,6 +20,8 @@ class Settings(BaseSettings):
     REDIS_SCAN_COUNT: int = 100
     CACHE_TTL_CONFIG_SEC: int = 60
     CACHE_TTL_FAQS_SEC: int = 300
+    CACHE_L1_TTL_SEC: float = 5.0
+    CACHE_L1_MAXSIZE: int = 1024
     REDIS_METRICS: bool = False
 
     OPENAI_API_KEY: str
@@ -35,6 +37,7 @@ class Settings(BaseSettings):
     RAG_SIMILARITY_THRESHOLD: float = 0.75
     RAG_CONTEXT_TOKEN_BUDGET: int = 1200
     RAG_MAX_CHUNK_TOKENS: int = 400
+    RAG_BINARY_CANDIDATES: int = 0
 
     VERIFY_TOKEN: str
     WH_TOKEN: str
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Final, FrozenSet
+from typing import Final, FrozenSet, Tuple
 
 RUN_MIGRATIONS_ON_STARTUP_ENV_VAR: Final[str] = "RUN_MIGRATIONS_ON_STARTUP"
 TRUTHY_ENV_VALUES: Final[FrozenSet[str]] = frozenset({"1", "true", "yes"})
 FALSY_ENV_VALUES: Final[FrozenSet[str]] = frozenset({"0", "false", "no"})
+MESSAGE_ROLES: Final[Tuple[str, ...]] = ("inbound", "assistant")
+USAGE_PARTITION_MONTHS_AHEAD: Final[int] = 3
+APPOINTMENT_STATUSES: Final[Tuple[str, ...]] = ("pending", "confirmed", "cancelled")
@@ -8,37 +8,57 @@ from sqlalchemy.orm import Session
 
 from logging_utils import get_logger
 from models import Appointment, FAQ, Message, Tenant, Usage
-from services.cache_invalidate import invalidate_tenant_namespace
+from services.cache_invalidate import invalidate_tenant_namespaces
 
 logger = get_logger(__name__)
 
-_TRACKED_MODELS: tuple[type[Any], ...] = (Tenant, Message, FAQ, Usage, Appointment)
+# Tracked model -> attribute holding its tenant id. Keyed by exact class so the
+# per-object check is one dict lookup rather than an isinstance() scan.
+_TENANT_ATTR: dict[type[Any], str] = {
+    Tenant: "id",
+    Message: "tenant_id",
+    FAQ: "tenant_id",
+    Usage: "tenant_id",
+    Appointment: "tenant_id",
+}
 _SESSION_KEY = "_cache_invalidation_tenant_ids"
+# The application loop, captured at startup so commits made from worker threads
+# (sync endpoints run in the threadpool) can still hand invalidation to it.
+_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def set_loop(loop: asyncio.AbstractEventLoop | None) -> None:
+    global _LOOP
+    _LOOP = loop
 
 
 def _extract_tenant_id(obj: Any) -> str | None:
-    if isinstance(obj, Tenant):
-        return str(obj.id)
-    tenant_id = getattr(obj, "tenant_id", None)
+    tenant_id = getattr(obj, _TENANT_ATTR[type(obj)])
     if tenant_id is None:
         return None
     return str(tenant_id)
 
 
-def _iter_tracked(session: Session) -> Iterable[Any]:
-    for collection in (session.new, session.dirty, session.deleted):
+def _iter_tracked(collections: Iterable[Iterable[Any]]) -> Iterable[Any]:
+    for collection in collections:
         for obj in collection:
-            if isinstance(obj, _TRACKED_MODELS):
+            if type(obj) in _TENANT_ATTR:
                 yield obj
 
 
 @event.listens_for(Session, "after_flush")
 def collect_tenant_ids(session: Session, _flush_context) -> None:  # type: ignore[override]
-    tenant_ids: Set[str] = session.info.setdefault(_SESSION_KEY, set())
-    for obj in _iter_tracked(session):
+    # session.dirty rescans the identity map on every access, so each set is
+    # read once and reused below.
+    collections = (session.new, session.dirty, session.deleted)
+    if not any(collections):
+        return
+    # The set is only created once a tracked object shows up, so flushes that
+    # touch untracked models leave session.info alone.
+    for obj in _iter_tracked(collections):
         tenant_id = _extract_tenant_id(obj)
         if tenant_id:
-            tenant_ids.add(tenant_id)
+            session.info.setdefault(_SESSION_KEY, set()).add(tenant_id)
 
 
 @event.listens_for(Session, "after_commit")
@@ -48,17 +68,24 @@ def schedule_tenant_cache_invalidation(session: Session) -> None:
         return
 
     try:
-        loop = asyncio.get_running_loop()
+        loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
     except RuntimeError:
+        loop = None
+
+    if loop is not None:
+        loop.create_task(invalidate_tenant_namespaces(tenant_ids))
+    elif _LOOP is not None and _LOOP.is_running():
+        asyncio.run_coroutine_threadsafe(
+            invalidate_tenant_namespaces(tenant_ids), _LOOP
+        )
+    else:
         logger.warning(
             "No running event loop for cache invalidation",
             extra={"tenant_ids": list(tenant_ids)},
         )
         return
 
-    for tenant_id in tenant_ids:
-        loop.create_task(invalidate_tenant_namespace(tenant_id))
-        logger.debug(
-            "Scheduled tenant cache invalidation",
-            extra={"tenant_id": tenant_id},
-        )
+    logger.debug(
+        "Scheduled tenant cache invalidation",
+        extra={"tenant_ids": sorted(tenant_ids)},
+    )
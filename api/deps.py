@@ -1,3 +1,5 @@
+import secrets
+
 from fastapi import HTTPException, Header
 from sqlalchemy.orm import Session
 from typing import Generator
@@ -10,6 +12,9 @@ from config import settings  # Import settings
 # Initialize logger
 logger = get_logger(__name__)
 
+# Settings are fixed for the process, so encode the admin token once.
+_ADMIN_TOKEN_BYTES = (settings.X_ADMIN_TOKEN or "").encode("utf-8")
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -44,16 +49,14 @@ def verify_admin_token(x_admin_token: str = Header(None, alias="X-Admin-Token"))
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get admin token from environment variable
-    admin_token = settings.X_ADMIN_TOKEN  # Use settings
-    if not admin_token:
+    if not _ADMIN_TOKEN_BYTES:
         logger.error("X_ADMIN_TOKEN environment variable is not set in config")
         raise HTTPException(
             status_code=500, detail="Admin API key is not configured on the server"
         )
 
-    # Verify token matches
-    if x_admin_token != admin_token:
+    # Constant-time comparison so response timing does not leak the token prefix
+    if not secrets.compare_digest(x_admin_token.encode("utf-8"), _ADMIN_TOKEN_BYTES):
         logger.warning(
             "Invalid admin token provided",
             extra={"provided_token_length": len(x_admin_token)},
@@ -64,5 +67,5 @@ def verify_admin_token(x_admin_token: str = Header(None, alias="X-Admin-Token"))
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    logger.info("Admin token verified successfully")
+    logger.debug("Admin token verified successfully")
     return x_admin_token
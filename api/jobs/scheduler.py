@@ -1,7 +1,9 @@
+from datetime import datetime
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI
 from .confirm_pending import confirm_pending
 from .send_reminders import send_reminders
+from .usage_partitions import ensure_usage_partitions
 
 scheduler = AsyncIOScheduler()
 
@@ -9,6 +11,9 @@ scheduler = AsyncIOScheduler()
 def init_scheduler(app: FastAPI) -> None:
     scheduler.add_job(confirm_pending, "interval", minutes=1)
     scheduler.add_job(send_reminders, "interval", minutes=1)
+    scheduler.add_job(
+        ensure_usage_partitions, "interval", hours=24, next_run_time=datetime.now()
+    )
 
     @app.on_event("startup")
     async def start_scheduler() -> None:
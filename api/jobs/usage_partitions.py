@@ -0,0 +1,167 @@
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from constants import USAGE_PARTITION_MONTHS_AHEAD
+from database import engine
+from logging_utils import get_logger
+
+SCHEMA = "public"
+logger = get_logger(__name__)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _usage_partition(month: date) -> Tuple[str, date, date]:
+    """Return the partition name and ``[from, to)`` bounds for ``month``.
+
+    Must match the names revision 010 gives the partitions it creates.
+    """
+
+    return f"usage_{month:%Y_%m}", month, _add_months(month, 1)
+
+
+def _usage_is_partitioned() -> bool:
+    with engine.connect() as conn:
+        result = conn.execute(
+            text(
+                """
+                SELECT c.relkind = 'p'
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.relname = 'usage' AND n.nspname = :schema_name
+                """
+            ),
+            {"schema_name": SCHEMA},
+        )
+        return bool(result.scalar())
+
+
+def _default_partition(conn: Connection) -> Optional[str]:
+    """Return the name of the DEFAULT partition of ``usage``, if it has one."""
+
+    result = conn.execute(
+        text(
+            """
+            SELECT c.relname
+            FROM pg_partitioned_table p
+            JOIN pg_class c ON c.oid = p.partdefid
+            WHERE p.partrelid = to_regclass(:parent)
+            """
+        ),
+        {"parent": f"{SCHEMA}.usage"},
+    )
+    name = result.scalar()
+    return str(name) if name else None
+
+
+def _default_months(conn: Connection, default: str) -> List[date]:
+    """Return the months that currently have rows in the default partition."""
+
+    result = conn.execute(
+        text(
+            f"""
+            SELECT DISTINCT date_trunc('month', msg_ts)::date
+            FROM {SCHEMA}.{default}
+            """
+        )
+    )
+    return [row[0] for row in result]
+
+
+def _create_partition(conn: Connection, partition: str, start: date, end: date) -> None:
+    conn.execute(
+        text(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SCHEMA}.{partition}
+            PARTITION OF {SCHEMA}.usage
+            FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')
+            """
+        )
+    )
+
+
+def _split_default(
+    conn: Connection, default: str, partition: str, start: date, end: date
+) -> int:
+    """Move a month's rows out of the default partition into their own partition.
+
+    PostgreSQL refuses to create a partition whose range already has rows in
+    the default partition, so the default is detached for the duration. Runs
+    inside the caller's transaction, which also holds the parent's lock.
+    """
+
+    conn.execute(
+        text(f"ALTER TABLE {SCHEMA}.usage DETACH PARTITION {SCHEMA}.{default}")
+    )
+    _create_partition(conn, partition, start, end)
+    moved = conn.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {SCHEMA}.{default}
+                WHERE msg_ts >= :start AND msg_ts < :end
+                RETURNING *
+            )
+            INSERT INTO {SCHEMA}.{partition} SELECT * FROM moved
+            """
+        ),
+        {"start": start, "end": end},
+    )
+    conn.execute(
+        text(f"ALTER TABLE {SCHEMA}.usage ATTACH PARTITION {SCHEMA}.{default} DEFAULT")
+    )
+    return moved.rowcount
+
+
+async def ensure_usage_partitions() -> None:
+    """Keep monthly usage partitions created ahead of the rows that need them.
+
+    Rows for a month without its own partition land in ``usage_default``
+    (the job was down for too long, or ``msg_ts`` is in the future). Those
+    months get their partition too, and their rows are moved into it.
+    """
+
+    if engine.dialect.name != "postgresql":
+        return
+    try:
+        if not _usage_is_partitioned():
+            return
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        with engine.connect() as conn:
+            default = _default_partition(conn)
+            stranded = set(_default_months(conn, default)) if default else set()
+        ahead = {
+            _add_months(current, offset)
+            for offset in range(USAGE_PARTITION_MONTHS_AHEAD + 1)
+        }
+        for month in sorted(ahead | stranded):
+            partition, start, end = _usage_partition(month)
+            try:
+                with engine.begin() as conn:
+                    if default is None or month not in stranded:
+                        _create_partition(conn, partition, start, end)
+                        continue
+                    moved = _split_default(conn, default, partition, start, end)
+                    logger.warning(
+                        "Moved usage rows out of the default partition",
+                        extra={
+                            "partition": partition,
+                            "default": default,
+                            "rows": moved,
+                        },
+                    )
+            except Exception as exc:
+                logger.error(
+                    "Creating usage partition failed",
+                    extra={"partition": partition, "error": str(exc)},
+                )
+    except Exception as exc:
+        logger.error(
+            "ensure_usage_partitions failed", extra={"error": str(exc)}, exc_info=exc
+        )
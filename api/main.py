@@ -1,3 +1,4 @@
+import asyncio
 import os
 from pathlib import Path
 from typing import Any, cast
@@ -15,7 +16,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from config import settings  # Import settings
 from schemas.common import ErrorResponse  # Import ErrorResponse schema
 from redis_client import RedisWrapper, redis_wrapper
-import db_hooks  # noqa: F401
+import db_hooks
 from constants import (
     FALSY_ENV_VALUES,
     RUN_MIGRATIONS_ON_STARTUP_ENV_VAR,
@@ -95,6 +96,8 @@ async def lifespan(app: FastAPI):
     setup_metrics(app)
     logger.info("Metrics setup complete")
 
+    db_hooks.set_loop(asyncio.get_running_loop())
+
     logger.info("Initializing Redis")
     await redis_wrapper.init()
     app.state.redis_wrapper = redis_wrapper
@@ -109,6 +112,7 @@ async def lifespan(app: FastAPI):
     try:
         yield
     finally:
+        db_hooks.set_loop(None)
         await redis_wrapper.close()
         app.state.redis = None
 
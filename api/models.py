@@ -1,24 +1,29 @@
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
     ForeignKey,
     Text,
-    Enum,
     TIMESTAMP,
     DateTime,
     Date,
     Boolean,
+    CheckConstraint,
+    Index,
     text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
+from constants import APPOINTMENT_STATUSES, MESSAGE_ROLES
 from database import Base
 
 # Note on ID types:
 # Tenant uses String ID type to support custom identifiers provided during creation
 # All other resources use Integer IDs with autoincrement for internal sequence management
+# (bigint for the high-volume messages and usage tables; SQLite keeps INTEGER so the
+# primary key stays a rowid alias and still autoincrements)
 # This difference is intentional to allow external systems to reference tenants by their own IDs
 # while maintaining simple numeric sequences for child resources
 
@@ -41,16 +46,46 @@ class Tenant(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    # Partitioning is owned by the migrations (010_partition_messages_usage):
+    # create_all cannot create the partitions, so the model stays a plain table.
+    # TEXT + CHECK instead of a native enum: adding a role is a NOT VALID
+    # constraint swap rather than ALTER TYPE (see 006_messages_role_check).
+    __table_args__ = (
+        CheckConstraint(
+            "role IN ({})".format(", ".join(f"'{role}'" for role in MESSAGE_ROLES)),
+            name="ck_messages_role",
+        ),
+        # Bot replies carry no WhatsApp id; keep NULLs out of the unique index.
+        # tenant_id is included because unique indexes must cover the
+        # partition key once 010_partition_messages_usage has run.
+        Index(
+            "ix_messages_wa_msg_id_nn",
+            "wa_msg_id",
+            "tenant_id",
+            unique=True,
+            postgresql_where=text("wa_msg_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_messages_tenant_id_ts",
+            "tenant_id",
+            "ts",
+            postgresql_include=["tokens"],
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        index=True,
+        autoincrement=True,
+    )
     tenant_id = Column(
         String(255),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
-    wa_msg_id = Column(String(255), nullable=True, unique=True)
-    role = Column(Enum("inbound", "assistant", name="role_enum"), nullable=False)
+    wa_msg_id = Column(String(255), nullable=True)
+    role = Column(Text, nullable=False)
     text = Column(Text, nullable=False)
     tokens = Column(Integer, nullable=True)
     ts = Column(TIMESTAMP, nullable=False, server_default=func.now())
@@ -61,19 +96,29 @@ class Message(Base):
 
 class FAQ(Base):
     __tablename__ = "faqs"
+    # Hash-partitioned by tenant in 002_faqs_tenant_partitions only; every
+    # partition carries its own HNSW graph so searches stay tenant-local.
+    # create_all cannot create partitions, so the model stays a plain table.
+    __table_args__ = (
+        Index(
+            "ix_faqs_embedding_ip_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_ip_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     tenant_id = Column(
         String(255),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     question = Column(
         String(500), nullable=False
     )  # Changed from Text to String for exact matching
     answer = Column(Text, nullable=False)
-    embedding = Column(Vector(1536), nullable=True)
+    embedding = Column(HALFVEC(1536), nullable=True)
 
     # Relationships
     tenant = relationship("Tenant", back_populates="faqs", passive_deletes=True)
@@ -81,13 +126,34 @@ class FAQ(Base):
 
 class Usage(Base):
     __tablename__ = "usage"
+    # Monthly RANGE partitions on msg_ts are created by the migrations only
+    # (see 010_partition_messages_usage and jobs.usage_partitions).
+    __table_args__ = (
+        # Covering index: per-tenant token totals run as index-only scans.
+        Index(
+            "ix_usage_tenant_ts_cov",
+            "tenant_id",
+            "msg_ts",
+            postgresql_include=[
+                "direction",
+                "tokens",
+                "prompt_tokens",
+                "completion_tokens",
+                "total_tokens",
+            ],
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        index=True,
+        autoincrement=True,
+    )
     tenant_id = Column(
         String(255),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     direction = Column(String(64), nullable=True)
     tokens = Column(Integer, nullable=True)
@@ -106,6 +172,26 @@ class Usage(Base):
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Same TEXT + CHECK pattern as messages.role (see 018_appointments_status_check).
+        CheckConstraint(
+            "status IN ({})".format(
+                ", ".join(f"'{status}'" for status in APPOINTMENT_STATUSES)
+            ),
+            name="ck_appointments_status",
+        ),
+        # Partial indexes for the confirm_pending and send_reminders jobs.
+        Index(
+            "ix_appointments_pending_starts_at",
+            "starts_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index(
+            "ix_appointments_reminder_due",
+            "starts_at",
+            postgresql_where=text("status = 'confirmed' AND NOT reminded"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     tenant_id = Column(
@@ -121,11 +207,7 @@ class Appointment(Base):
         String(255), nullable=True
     )  # Assuming email addresses are up to 255 chars
     starts_at = Column(DateTime(timezone=True), nullable=False)
-    status = Column(
-        Enum("pending", "confirmed", "cancelled", name="appt_status_enum"),
-        nullable=False,
-        default="pending",
-    )
+    status = Column(Text, nullable=False, default="pending")
     google_event_id = Column(String(255), nullable=True)
     reminded = Column(Boolean, default=False, nullable=False)
     created_ts = Column(DateTime(timezone=True), server_default=func.now())
@@ -133,15 +215,17 @@ class Appointment(Base):
 
 class OwnerContact(Base):
     __tablename__ = "owner_contacts"
+    __table_args__ = (
+        Index("ix_owner_contacts_tenant_phone", "tenant_id", "phone_number"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     tenant_id = Column(
         String(255),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
-    phone_number = Column(String(64), nullable=False, index=True)
+    phone_number = Column(String(64), nullable=False)
     display_name = Column(String(255), nullable=True)
     created_ts = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -150,13 +234,15 @@ class OwnerContact(Base):
 
 class Unavailability(Base):
     __tablename__ = "unavailability"
+    __table_args__ = (
+        Index("ix_unavailability_tenant_dates", "tenant_id", "starts_on", "ends_on"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     tenant_id = Column(
         String(255),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     owner_phone = Column(String(64), nullable=False)
     starts_on = Column(Date, nullable=False)
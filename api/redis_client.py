@@ -2,16 +2,18 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import json
 import time
-from typing import Any, Awaitable, Callable, Optional, TypeVar
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple, TypeVar
 from urllib.parse import urlparse
 
+import orjson
 from redis import asyncio as aioredis
 from redis.exceptions import RedisError
 
 from config import settings
 from logging_utils import get_logger
+from monitoring import CACHE_HIT, CACHE_MISS
 
 T = TypeVar("T")
 
@@ -20,6 +22,49 @@ logger = get_logger(__name__)
 _METRICS_ENABLED = bool(getattr(settings, "REDIS_METRICS", False))
 
 
+# Process-local cache in front of Redis: key -> (expires_at, value). Values are
+# shared with callers, so they must be treated as read-only.
+_L1: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+
+def _l1_ttl() -> float:
+    return float(getattr(settings, "CACHE_L1_TTL_SEC", 0) or 0)
+
+
+def _l1_get(key: str) -> Tuple[bool, Any]:
+    # A disabled L1 is not a miss; counting it would read as a 0% hit rate.
+    if _l1_ttl() <= 0:
+        return False, None
+    entry = _L1.get(key)
+    if entry is None:
+        CACHE_MISS.labels(bucket="l1").inc()
+        return False, None
+    expires_at, value = entry
+    if expires_at <= time.monotonic():
+        _L1.pop(key, None)
+        CACHE_MISS.labels(bucket="l1").inc()
+        return False, None
+    _L1.move_to_end(key)
+    CACHE_HIT.labels(bucket="l1").inc()
+    return True, value
+
+
+def _l1_put(key: str, value: Any) -> None:
+    ttl = _l1_ttl()
+    if ttl <= 0 or value is None:
+        return
+    _L1[key] = (time.monotonic() + ttl, value)
+    _L1.move_to_end(key)
+    maxsize = max(1, int(getattr(settings, "CACHE_L1_MAXSIZE", 1024)))
+    while len(_L1) > maxsize:
+        _L1.popitem(last=False)
+
+
+def l1_invalidate_prefix(prefix: str) -> None:
+    for key in [key for key in _L1 if key.startswith(prefix)]:
+        _L1.pop(key, None)
+
+
 def _hashed_key(key: str) -> str:
     return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
 
@@ -143,6 +188,35 @@ def ns_key(raw: str) -> str:
     return f"{prefix}:{raw}"
 
 
+def _decode_cached(key: str, cached: Any) -> Tuple[bool, Any]:
+    try:
+        value = orjson.loads(cached)
+    except orjson.JSONDecodeError:
+        if _METRICS_ENABLED:
+            logger.debug(
+                "Redis cache decode error",
+                extra={"cache_key": _hashed_key(key)},
+            )
+        return False, None
+    CACHE_HIT.labels(bucket="redis").inc()
+    if _METRICS_ENABLED:
+        logger.debug("Redis cache hit", extra={"cache_key": _hashed_key(key)})
+    return True, value
+
+
+def _encode_payload(key: str, value: Any) -> Optional[bytes]:
+    # orjson emits compact UTF-8 bytes, which redis-py writes without re-encoding.
+    try:
+        return orjson.dumps(value)
+    except orjson.JSONEncodeError as exc:
+        if _METRICS_ENABLED:
+            logger.debug(
+                "Redis cache serialization error",
+                extra={"cache_key": _hashed_key(key), "error": str(exc)},
+            )
+        return None
+
+
 async def cached_json(
     key: str, ttl: int, loader_async_fn: Callable[[], Awaitable[T]]
 ) -> Optional[T]:
@@ -156,6 +230,10 @@ async def cached_json(
             )
         return await loader_async_fn()
 
+    hit, value = _l1_get(key)
+    if hit:
+        return value
+
     try:
         cached = await client.get(key)
     except RedisError as exc:
@@ -167,34 +245,22 @@ async def cached_json(
         return await loader_async_fn()
 
     if cached is not None:
-        try:
-            value = json.loads(cached)
-        except json.JSONDecodeError:
-            if _METRICS_ENABLED:
-                logger.debug(
-                    "Redis cache decode error",
-                    extra={"cache_key": _hashed_key(key)},
-                )
-        else:
-            if _METRICS_ENABLED:
-                logger.debug("Redis cache hit", extra={"cache_key": _hashed_key(key)})
+        hit, value = _decode_cached(key, cached)
+        if hit:
+            _l1_put(key, value)
             return value
 
+    CACHE_MISS.labels(bucket="redis").inc()
     if _METRICS_ENABLED:
         logger.debug("Redis cache miss", extra={"cache_key": _hashed_key(key)})
 
     value = await loader_async_fn()
     if value is None or ttl <= 0:
         return value
+    _l1_put(key, value)
 
-    try:
-        payload = json.dumps(value, separators=(",", ":"))
-    except (TypeError, ValueError) as exc:
-        if _METRICS_ENABLED:
-            logger.debug(
-                "Redis cache serialization error",
-                extra={"cache_key": _hashed_key(key), "error": str(exc)},
-            )
+    payload = _encode_payload(key, value)
+    if payload is None:
         return value
 
     try:
@@ -208,9 +274,77 @@ async def cached_json(
     return value
 
 
+async def cached_json_many(
+    entries: Sequence[Tuple[str, int, Callable[[], Awaitable[Any]]]],
+) -> List[Any]:
+    """Resolve several ``cached_json`` lookups with one MGET and one write pipeline.
+
+    Each entry is ``(key, ttl, loader)``; results come back in entry order.
+    Misses are loaded sequentially (loaders may share a DB session) and
+    written back together.
+    """
+
+    client = redis_wrapper.client
+    if client is None:
+        return [await loader() for _key, _ttl, loader in entries]
+
+    local = [_l1_get(key) for key, _ttl, _loader in entries]
+    pending = [
+        entry for entry, (hit, _value) in zip(entries, local, strict=True) if not hit
+    ]
+    cached_values: List[Any] = []
+    if pending:
+        try:
+            cached_values = await client.mget([key for key, _ttl, _loader in pending])
+        except RedisError as exc:
+            if _METRICS_ENABLED:
+                logger.debug("Redis cache read error", extra={"error": str(exc)})
+            cached_values = [None] * len(pending)
+    remote = iter(cached_values)
+
+    results: List[Any] = []
+    writes: List[Tuple[str, int, bytes]] = []
+    for (key, ttl, loader), (l1_hit, l1_value) in zip(entries, local, strict=True):
+        if l1_hit:
+            results.append(l1_value)
+            continue
+        cached = next(remote)
+        if cached is not None:
+            hit, value = _decode_cached(key, cached)
+            if hit:
+                _l1_put(key, value)
+                results.append(value)
+                continue
+
+        CACHE_MISS.labels(bucket="redis").inc()
+        if _METRICS_ENABLED:
+            logger.debug("Redis cache miss", extra={"cache_key": _hashed_key(key)})
+        value = await loader()
+        results.append(value)
+        if value is None or ttl <= 0:
+            continue
+        _l1_put(key, value)
+        payload = _encode_payload(key, value)
+        if payload is not None:
+            writes.append((key, ttl, payload))
+
+    if writes:
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, ttl, payload in writes:
+                    pipe.setex(key, ttl, payload)
+                await pipe.execute()
+        except RedisError as exc:
+            if _METRICS_ENABLED:
+                logger.debug("Redis cache write error", extra={"error": str(exc)})
+    return results
+
+
 __all__ = [
     "RedisWrapper",
     "cached_json",
+    "cached_json_many",
+    "l1_invalidate_prefix",
     "ns_key",
     "redis_wrapper",
 ]
@@ -5,7 +5,9 @@ from __future__ import annotations
 import asyncio
 from typing import Any, Dict, List
 
-from sqlalchemy import Select, select
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import Select, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import BIT
 from sqlalchemy.orm import Session
 
 from config import settings
@@ -16,6 +18,8 @@ from ai import generate_embedding
 
 logger = get_logger(__name__)
 
+EMBEDDING_DIMENSIONS = 1536
+
 
 def _score_from_distance(distance: float | None) -> float:
     if distance is None or not isinstance(distance, (int, float)):
@@ -28,22 +32,73 @@ def _score_from_distance(distance: float | None) -> float:
     return score
 
 
-def _faq_similarity_stmt(embedding: List[float], tenant_id: str, limit: int) -> Select[Any]:
-    return (
-        select(
-            FAQ.id,
-            FAQ.question,
-            FAQ.answer,
-            FAQ.embedding.cosine_distance(list(embedding)).label("distance"),
+def _binary_code(expr: Any) -> Any:
+    """Match the ``ix_faqs_embedding_bq_hnsw`` expression so the index is usable."""
+
+    return cast(func.binary_quantize(expr), BIT(EMBEDDING_DIMENSIONS))
+
+
+def _ip_distance(expr: Any, query_vector: List[float]) -> Any:
+    """Cosine distance for unit vectors, computed as ``1 + (embedding <#> query)``.
+
+    Embeddings are stored L2-normalized, so the negative inner product served by
+    ``ix_faqs_embedding_ip_hnsw`` orders rows exactly like cosine distance.
+    """
+
+    return 1 + expr.max_inner_product(query_vector)
+
+
+def _faq_similarity_stmt(
+    embedding: List[float], tenant_id: str, limit: int
+) -> Select[Any]:
+    query_vector = list(embedding)
+    candidates = settings.RAG_BINARY_CANDIDATES
+    if candidates <= 0:
+        return (
+            select(
+                FAQ.id,
+                FAQ.question,
+                FAQ.answer,
+                _ip_distance(FAQ.embedding, query_vector).label("distance"),
+            )
+            .where(FAQ.tenant_id == tenant_id)
+            .where(FAQ.embedding.isnot(None))
+            .order_by(FAQ.embedding.max_inner_product(query_vector))
+            .limit(limit)
         )
+
+    # Two-stage search: walk the compact bit-code HNSW graph (hamming distance)
+    # for a candidate pool, then rerank that pool by inner product on the stored vectors.
+    query_code = _binary_code(
+        cast(
+            literal(query_vector, HALFVEC(EMBEDDING_DIMENSIONS)),
+            HALFVEC(EMBEDDING_DIMENSIONS),
+        )
+    )
+    coarse = (
+        select(FAQ.id, FAQ.question, FAQ.answer, FAQ.embedding)
         .where(FAQ.tenant_id == tenant_id)
         .where(FAQ.embedding.isnot(None))
-        .order_by(FAQ.embedding.cosine_distance(list(embedding)))
+        .order_by(_binary_code(FAQ.embedding).op("<~>")(query_code))
+        .limit(max(candidates, limit))
+        .subquery("coarse")
+    )
+    distance = _ip_distance(coarse.c.embedding, query_vector)
+    return (
+        select(
+            coarse.c.id,
+            coarse.c.question,
+            coarse.c.answer,
+            distance.label("distance"),
+        )
+        .order_by(distance)
         .limit(limit)
     )
 
 
-async def top_k_faqs(db: Session, tenant_id: str, query_text: str) -> List[Dict[str, Any]]:
+async def top_k_faqs(
+    db: Session, tenant_id: str, query_text: str
+) -> List[Dict[str, Any]]:
     """Return the most relevant FAQ entries for a tenant."""
 
     if not query_text.strip():
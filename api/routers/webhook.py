@@ -1,7 +1,7 @@
 import json
 import re
 from datetime import datetime, timezone
-from typing import Any, Mapping, Optional, cast
+from typing import Any, Dict, List, Mapping, Optional, cast
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, Query, Request, Response
@@ -12,7 +12,11 @@ from config import settings
 from deps import get_db
 from logging_utils import get_logger
 from models import Appointment, Message, Tenant, Usage
-from services.tenant_config import get_tenant_config, get_tenant_faqs
+from services.tenant_config import (
+    get_tenant_config,
+    get_tenant_config_and_faqs,
+    get_tenant_faqs,
+)
 from services.vacation_wizard import handle_vacation_wizard
 from services.whatsapp import send_whatsapp_message
 from utils.i18n import detect_lang, tr
@@ -86,7 +90,19 @@ async def webhook_handler(request: Request, db: Session = Depends(get_db)):
                     )
                     continue
 
-                tenant = await get_tenant_config(db, cast(str, tenant_db.id))
+                text_messages = [
+                    message
+                    for message in value.get("messages", [])
+                    if message.get("type") == "text"
+                ]
+                # Text messages need the FAQs too; fetch both in one round-trip.
+                faqs: Optional[List[Dict[str, Any]]] = None
+                if text_messages:
+                    tenant, faqs = await get_tenant_config_and_faqs(
+                        db, cast(str, tenant_db.id)
+                    )
+                else:
+                    tenant = await get_tenant_config(db, cast(str, tenant_db.id))
                 if not tenant:
                     logger.warning(
                         "Tenant config not found", extra={"tenant_id": tenant_db.id}
@@ -95,9 +111,8 @@ async def webhook_handler(request: Request, db: Session = Depends(get_db)):
 
                 # Process messages
                 redis_client = getattr(request.app.state, "redis", None)
-                for message in value.get("messages", []):
-                    if message.get("type") == "text":
-                        await process_message(db, tenant, message, redis_client)
+                for message in text_messages:
+                    await process_message(db, tenant, message, redis_client, faqs=faqs)
     except Exception as e:
         # Log the error but still return success
         logger.error(
@@ -114,6 +129,7 @@ async def process_message(
     tenant: Mapping[str, Any],
     message: Mapping[str, Any],
     redis_client: Optional[Any],
+    faqs: Optional[List[Dict[str, Any]]] = None,
 ):
     """
     Process a message from WhatsApp
@@ -294,7 +310,8 @@ async def process_message(
                 return
 
         # Check for exact FAQ match before using RAG
-        faqs = await get_tenant_faqs(db, cast(str, tenant["id"]))
+        if faqs is None:
+            faqs = await get_tenant_faqs(db, cast(str, tenant["id"]))
         faq = next((f for f in faqs if f["question"].lower() == text.lower()), None)
 
         if faq:
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from typing import Iterable
+
 from redis.exceptions import RedisError
 
 from config import settings
 from logging_utils import get_logger
-from redis_client import ns_key, redis_wrapper
+from redis_client import l1_invalidate_prefix, ns_key, redis_wrapper
 
 logger = get_logger(__name__)
 
 
 async def invalidate_tenant_namespace(tenant_id: str) -> None:
+    # Other workers' L1 entries age out within CACHE_L1_TTL_SEC.
+    l1_invalidate_prefix(ns_key(f"tenant:{tenant_id}:"))
+
     client = redis_wrapper.client
     if client is None:
         logger.debug(
@@ -41,4 +46,49 @@ async def invalidate_tenant_namespace(tenant_id: str) -> None:
         )
 
 
-__all__ = ["invalidate_tenant_namespace"]
+async def invalidate_tenant_namespaces(tenant_ids: Iterable[str]) -> None:
+    """Invalidate several tenants with one keyspace SCAN instead of one per tenant."""
+
+    unique_ids = sorted(set(tenant_ids))
+    if len(unique_ids) <= 1:
+        for tenant_id in unique_ids:
+            await invalidate_tenant_namespace(tenant_id)
+        return
+
+    prefixes = tuple(ns_key(f"tenant:{tenant_id}:") for tenant_id in unique_ids)
+    for prefix in prefixes:
+        l1_invalidate_prefix(prefix)
+
+    client = redis_wrapper.client
+    if client is None:
+        logger.debug(
+            "Redis client unavailable; skipping namespace invalidation",
+            extra={"tenant_ids": unique_ids},
+        )
+        return
+
+    scan_count = max(1, getattr(settings, "REDIS_SCAN_COUNT", 100))
+    try:
+        batch: list[str] = []
+        async for key in client.scan_iter(match=ns_key("tenant:*"), count=scan_count):
+            if not key.startswith(prefixes):
+                continue
+            batch.append(key)
+            if len(batch) >= scan_count:
+                await client.unlink(*batch)
+                batch.clear()
+        if batch:
+            await client.unlink(*batch)
+    except RedisError as exc:
+        logger.warning(
+            "Failed to invalidate tenant cache namespaces",
+            extra={"tenant_ids": unique_ids, "error": str(exc)},
+        )
+    except Exception as exc:  # pragma: no cover - defensive catch
+        logger.warning(
+            "Unexpected error during tenant cache invalidation",
+            extra={"tenant_ids": unique_ids, "error": str(exc)},
+        )
+
+
+__all__ = ["invalidate_tenant_namespace", "invalidate_tenant_namespaces"]
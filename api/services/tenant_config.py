@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from config import settings
 from logging_utils import get_logger
 from models import FAQ, Tenant
-from redis_client import cached_json, ns_key
+from redis_client import cached_json, cached_json_many, ns_key
 
 logger = get_logger(__name__)
 
@@ -20,22 +21,36 @@ def tenant_faqs_key(tenant_id: str) -> str:
     return ns_key(f"tenant:{tenant_id}:faqs:v1")
 
 
+# Column-only selects built once: the loaders only need plain dicts, so no ORM
+# instances are constructed and the compiled form stays in the statement cache.
+_TENANT_CONFIG_STMT = select(
+    Tenant.id, Tenant.phone_id, Tenant.wh_token, Tenant.system_prompt
+).where(Tenant.id == bindparam("tenant_id"))
+_TENANT_FAQS_STMT = select(FAQ.id, FAQ.question, FAQ.answer).where(
+    FAQ.tenant_id == bindparam("tenant_id")
+)
+
+
+def _load_tenant_config(db: Session, tenant_id: str) -> Optional[Dict[str, Any]]:
+    row = db.execute(_TENANT_CONFIG_STMT, {"tenant_id": tenant_id}).mappings().first()
+    if row is None:
+        logger.debug("Tenant config not found", extra={"tenant_id": tenant_id})
+        return None
+    return dict(row)
+
+
+def _load_tenant_faqs(db: Session, tenant_id: str) -> List[Dict[str, Any]]:
+    result = db.execute(_TENANT_FAQS_STMT, {"tenant_id": tenant_id})
+    return [dict(row) for row in result.mappings()]
+
+
 async def get_tenant_config(
     db: Session, tenant_id: str, ttl: Optional[int] = None
 ) -> Optional[Dict[str, Any]]:
     cache_ttl = settings.CACHE_TTL_CONFIG_SEC if ttl is None else ttl
 
     async def _loader() -> Optional[Dict[str, Any]]:
-        tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
-        if tenant is None:
-            logger.debug("Tenant config not found", extra={"tenant_id": tenant_id})
-            return None
-        return {
-            "id": tenant.id,
-            "phone_id": tenant.phone_id,
-            "wh_token": tenant.wh_token,
-            "system_prompt": tenant.system_prompt,
-        }
+        return _load_tenant_config(db, tenant_id)
 
     return await cached_json(tenant_config_key(tenant_id), cache_ttl, _loader)
 
@@ -46,22 +61,39 @@ async def get_tenant_faqs(
     cache_ttl = settings.CACHE_TTL_FAQS_SEC if ttl is None else ttl
 
     async def _loader() -> List[Dict[str, Any]]:
-        rows = db.query(FAQ).filter(FAQ.tenant_id == tenant_id).all()
-        return [
-            {
-                "id": faq.id,
-                "question": faq.question,
-                "answer": faq.answer,
-            }
-            for faq in rows
-        ]
+        return _load_tenant_faqs(db, tenant_id)
 
     cached = await cached_json(tenant_faqs_key(tenant_id), cache_ttl, _loader)
     return cached or []
 
 
+async def get_tenant_config_and_faqs(
+    db: Session, tenant_id: str
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Fetch config and FAQs in one Redis round-trip; misses load from the DB."""
+
+    async def _config_loader() -> Optional[Dict[str, Any]]:
+        return _load_tenant_config(db, tenant_id)
+
+    async def _faqs_loader() -> List[Dict[str, Any]]:
+        return _load_tenant_faqs(db, tenant_id)
+
+    config, faqs = await cached_json_many(
+        [
+            (
+                tenant_config_key(tenant_id),
+                settings.CACHE_TTL_CONFIG_SEC,
+                _config_loader,
+            ),
+            (tenant_faqs_key(tenant_id), settings.CACHE_TTL_FAQS_SEC, _faqs_loader),
+        ]
+    )
+    return config, faqs or []
+
+
 __all__ = [
     "get_tenant_config",
+    "get_tenant_config_and_faqs",
     "get_tenant_faqs",
     "tenant_config_key",
     "tenant_faqs_key",
@@ -0,0 +1,92 @@
+import importlib
+import os
+import sys
+from types import ModuleType
+from typing import Any, Iterator
+
+sys.path.append("api")
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_admin_token.db")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("VERIFY_TOKEN", "verify")
+os.environ.setdefault("WH_TOKEN", "wh-token")
+os.environ.setdefault("WH_PHONE_ID", "phone-1")
+os.environ.setdefault("X_ADMIN_TOKEN", "admin")
+
+import deps  # noqa: E402
+from config import settings  # noqa: E402
+
+
+def _client(module: ModuleType) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/admin-only", dependencies=[Depends(module.verify_admin_token)])
+    def admin_only() -> dict:
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def deps_with_token(monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+    """Reload ``deps`` so its import-time token reflects a patched setting."""
+
+    def load(token: str) -> ModuleType:
+        monkeypatch.setattr(settings, "X_ADMIN_TOKEN", token)
+        return importlib.reload(deps)
+
+    yield load
+    monkeypatch.undo()
+    importlib.reload(deps)
+
+
+def test_matching_token_is_accepted() -> None:
+    with _client(deps) as client:
+        response = client.get(
+            "/admin-only", headers={"X-Admin-Token": settings.X_ADMIN_TOKEN}
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+
+
+@pytest.mark.parametrize("token", ["wrong", "x", "admin-but-longer"])
+def test_mismatched_token_is_rejected(token: str) -> None:
+    with _client(deps) as client:
+        response = client.get("/admin-only", headers={"X-Admin-Token": token})
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid admin token"
+
+
+def test_missing_header_is_rejected() -> None:
+    with _client(deps) as client:
+        response = client.get("/admin-only")
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Admin token is required"
+
+
+def test_hoisted_token_comes_from_settings(deps_with_token: Any) -> None:
+    module = deps_with_token("rotated-token")
+    with _client(module) as client:
+        accepted = client.get("/admin-only", headers={"X-Admin-Token": "rotated-token"})
+        rejected = client.get(
+            "/admin-only", headers={"X-Admin-Token": os.environ["X_ADMIN_TOKEN"]}
+        )
+
+    assert accepted.status_code == 200
+    assert rejected.status_code == 401
+
+
+def test_empty_configured_token_fails_closed(deps_with_token: Any) -> None:
+    module = deps_with_token("")
+    with _client(module) as client:
+        response = client.get("/admin-only", headers={"X-Admin-Token": "anything"})
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Admin API key is not configured on the server"
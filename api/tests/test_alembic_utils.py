@@ -0,0 +1,207 @@
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Sequence
+
+sys.path.append("api")
+
+import pytest
+from sqlalchemy import create_engine, text
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_alembic_utils.db")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("VERIFY_TOKEN", "verify")
+os.environ.setdefault("WH_TOKEN", "wh-token")
+os.environ.setdefault("WH_PHONE_ID", "phone-1")
+os.environ.setdefault("X_ADMIN_TOKEN", "admin")
+
+import alembic_utils  # noqa: E402
+
+REVISION_TEMPLATE = """
+revision = "{revision}"
+down_revision = {down_revision!r}
+branch_labels = None
+depends_on = None
+"""
+
+
+def _write_revision(
+    versions: Path, revision: str, down_revision: Any, mtime: float
+) -> Path:
+    path = versions / f"{revision}.py"
+    path.write_text(
+        REVISION_TEMPLATE.format(revision=revision, down_revision=down_revision)
+    )
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def alembic_ini(tmp_path: Path) -> Iterator[str]:
+    versions = tmp_path / "migrations" / "versions"
+    versions.mkdir(parents=True)
+    _write_revision(versions, "r1", None, 1000.0)
+    ini = tmp_path / "alembic.ini"
+    ini.write_text(f"[alembic]\nscript_location = {tmp_path / 'migrations'}\n")
+    os.utime(versions, (1000.0, 1000.0))
+    os.utime(ini, (1000.0, 1000.0))
+    alembic_utils._cached_heads.cache_clear()
+    alembic_utils._versions_dir.cache_clear()
+    yield str(ini)
+    alembic_utils._cached_heads.cache_clear()
+    alembic_utils._versions_dir.cache_clear()
+
+
+def test_script_heads_parses_ini_once(
+    alembic_ini: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    configs: List[str] = []
+    real_config = alembic_utils.AlembicConfig
+
+    def counting_config(path: str) -> Any:
+        configs.append(path)
+        return real_config(path)
+
+    monkeypatch.setattr(alembic_utils, "AlembicConfig", counting_config)
+
+    for _ in range(3):
+        assert alembic_utils._script_heads(alembic_ini) == ("r1",)
+
+    # One parse to find versions/, one to load the script directory.
+    assert len(configs) == 2
+
+
+def test_script_heads_sees_revision_edited_in_place(alembic_ini: str) -> None:
+    versions = Path(alembic_ini).parent / "migrations" / "versions"
+    assert alembic_utils._script_heads(alembic_ini) == ("r1",)
+
+    # A new head written into an existing file leaves the directory mtime alone.
+    path = versions / "r1.py"
+    path.write_text(REVISION_TEMPLATE.format(revision="r1b", down_revision=None))
+    os.utime(path, (2000.0, 2000.0))
+    os.utime(versions, (1000.0, 1000.0))
+
+    assert alembic_utils._script_heads(alembic_ini) == ("r1b",)
+
+
+def test_script_heads_sees_added_revision(alembic_ini: str) -> None:
+    versions = Path(alembic_ini).parent / "migrations" / "versions"
+    assert alembic_utils._script_heads(alembic_ini) == ("r1",)
+
+    _write_revision(versions, "r2", "r1", 1000.0)
+    os.utime(versions, (2000.0, 2000.0))
+
+    assert alembic_utils._script_heads(alembic_ini) == ("r2",)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, ""),
+        ("", '""'),
+        ("plain", '"plain"'),
+        ('say "hi"', '"say ""hi"""'),
+        ("a,b\nc", '"a,b\nc"'),
+        (7, '"7"'),
+        ([0.5, -1.0], '"[0.5, -1.0]"'),
+    ],
+)
+def test_csv_field_quotes_values_and_keeps_null_unquoted(
+    value: Any, expected: str
+) -> None:
+    assert alembic_utils._csv_field(value) == expected
+
+
+def test_copy_stream_reads_rows_lazily_in_chunks() -> None:
+    consumed: List[int] = []
+
+    def rows() -> Iterator[Sequence[Any]]:
+        for index in range(3):
+            consumed.append(index)
+            yield (index, None if index == 1 else f"row {index}")
+
+    stream = alembic_utils._CopyStream(rows())
+    first = stream.read(4)
+    assert consumed == [0]
+
+    chunks = [first]
+    while chunk := stream.read(4):
+        chunks.append(chunk)
+
+    assert all(len(chunk) <= 4 for chunk in chunks)
+    assert "".join(chunks) == '"0","row 0"\n"1",\n"2","row 2"\n'
+    assert stream.count == 3
+    assert stream.read() == ""
+
+
+class StubCursor:
+    def __init__(self) -> None:
+        self.sql = ""
+        self.data = ""
+        self.closed = False
+
+    def copy_expert(self, sql: str, stream: Any) -> None:
+        self.sql = sql
+        while chunk := stream.read(8):
+            self.data += chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_bulk_copy_streams_csv_through_one_copy(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cursor = StubCursor()
+    raw = SimpleNamespace(cursor=lambda: cursor)
+    bind = SimpleNamespace(connection=SimpleNamespace(dbapi_connection=raw))
+    monkeypatch.setattr(alembic_utils, "op", SimpleNamespace(get_bind=lambda: bind))
+
+    sent = alembic_utils.bulk_copy(
+        "public.faqs", ["id", "embedding"], iter([(1, [0.5]), (2, None)])
+    )
+
+    assert sent == 2
+    assert cursor.sql == (
+        "COPY public.faqs (id, embedding) FROM STDIN WITH (FORMAT csv)"
+    )
+    assert cursor.data == '"1","[0.5]"\n"2",\n'
+    assert cursor.closed
+
+
+def test_batched_update_commits_each_page_separately(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = create_engine("sqlite://")
+    blocks: List[int] = []
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(
+            text("INSERT INTO items (id, name) VALUES (:id, :name)"),
+            [{"id": index, "name": f"item {index}"} for index in range(1, 6)],
+        )
+
+        @contextmanager
+        def autocommit_block() -> Iterator[None]:
+            blocks.append(len(blocks))
+            yield
+
+        context = SimpleNamespace(autocommit_block=autocommit_block)
+        monkeypatch.setattr(
+            alembic_utils,
+            "op",
+            SimpleNamespace(get_context=lambda: context, get_bind=lambda: conn),
+        )
+
+        def upper(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+            return [{"id": row.id, "name": row.name.upper()} for row in rows]
+
+        updated = alembic_utils.batched_update("items", ["name"], upper, batch_size=2)
+        names = conn.execute(text("SELECT name FROM items ORDER BY id")).scalars()
+
+        assert updated == 5
+        assert list(names) == [f"ITEM {index}" for index in range(1, 6)]
+    # Three full or partial pages plus the empty read that ends the walk.
+    assert len(blocks) == 4
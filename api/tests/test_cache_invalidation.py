@@ -0,0 +1,129 @@
+import asyncio
+import fnmatch
+import os
+import sys
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+sys.path.append("api")
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_cache_invalidation.db")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("VERIFY_TOKEN", "verify")
+os.environ.setdefault("WH_TOKEN", "wh-token")
+os.environ.setdefault("WH_PHONE_ID", "phone-1")
+os.environ.setdefault("X_ADMIN_TOKEN", "admin")
+
+import db_hooks  # noqa: E402
+import redis_client  # noqa: E402
+from database import Base, SessionLocal, engine  # noqa: E402
+from models import Tenant  # noqa: E402
+from redis_client import ns_key  # noqa: E402
+
+TENANT_KEYS = {
+    "t1": ("tenant:t1:config", "tenant:t1:faqs"),
+    "t2": ("tenant:t2:config",),
+    "t10": ("tenant:t10:config",),
+}
+
+
+class StubRedis:
+    def __init__(self) -> None:
+        self.store: Dict[str, str] = {}
+        self.unlink_calls: List[Tuple[Optional[asyncio.AbstractEventLoop], int]] = []
+
+    async def scan_iter(self, match: str, count: int = 100) -> AsyncIterator[str]:
+        for key in list(self.store):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def unlink(self, *keys: str) -> int:
+        self.unlink_calls.append((asyncio.get_running_loop(), threading.get_ident()))
+        for key in keys:
+            self.store.pop(key, None)
+        return len(keys)
+
+
+@pytest.fixture(autouse=True)
+def reset_database() -> Iterator[None]:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    redis_client._L1.clear()
+    yield
+    redis_client._L1.clear()
+    db_hooks.set_loop(None)
+    Base.metadata.drop_all(bind=engine)
+
+
+def _seed_caches(stub: StubRedis) -> None:
+    for raw_keys in TENANT_KEYS.values():
+        for raw_key in raw_keys:
+            stub.store[ns_key(raw_key)] = "{}"
+            redis_client._l1_put(ns_key(raw_key), {"cached": True})
+
+
+def _commit_tenants(tenant_ids: List[str]) -> int:
+    session = SessionLocal()
+    try:
+        for tenant_id in tenant_ids:
+            session.add(
+                Tenant(id=tenant_id, phone_id=f"phone-{tenant_id}", wh_token="token")
+            )
+        session.commit()
+    finally:
+        session.close()
+    return threading.get_ident()
+
+
+async def _wait_for(condition: Any, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("invalidation did not run")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("tenant_ids", [["t1"], ["t1", "t2"]])
+def test_worker_thread_commit_invalidates_on_captured_loop(
+    monkeypatch: pytest.MonkeyPatch, tenant_ids: List[str]
+) -> None:
+    stub = StubRedis()
+    monkeypatch.setattr(redis_client.redis_wrapper, "client", stub)
+    _seed_caches(stub)
+    expected_gone = {
+        ns_key(raw_key)
+        for tenant_id in tenant_ids
+        for raw_key in TENANT_KEYS[tenant_id]
+    }
+
+    async def scenario() -> Tuple[asyncio.AbstractEventLoop, int, int]:
+        loop = asyncio.get_running_loop()
+        db_hooks.set_loop(loop)
+        # Sync endpoints commit from the threadpool, where no loop is running.
+        commit_thread = await asyncio.to_thread(_commit_tenants, tenant_ids)
+        await _wait_for(lambda: stub.unlink_calls)
+        return loop, threading.get_ident(), commit_thread
+
+    loop, loop_thread, commit_thread = asyncio.run(scenario())
+
+    assert commit_thread != loop_thread
+    assert stub.unlink_calls == [(loop, loop_thread)]
+    assert expected_gone.isdisjoint(stub.store)
+    assert expected_gone.isdisjoint(redis_client._L1)
+    assert ns_key("tenant:t10:config") in stub.store
+    assert ns_key("tenant:t10:config") in redis_client._L1
+
+
+def test_commit_without_captured_loop_skips_invalidation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    stub = StubRedis()
+    monkeypatch.setattr(redis_client.redis_wrapper, "client", stub)
+    _seed_caches(stub)
+
+    _commit_tenants(["t1"])
+
+    assert stub.unlink_calls == []
+    assert ns_key("tenant:t1:config") in stub.store
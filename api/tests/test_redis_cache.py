@@ -0,0 +1,179 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.append("api")
+
+import orjson
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_redis_cache.db")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("VERIFY_TOKEN", "verify")
+os.environ.setdefault("WH_TOKEN", "wh-token")
+os.environ.setdefault("WH_PHONE_ID", "phone-1")
+os.environ.setdefault("X_ADMIN_TOKEN", "admin")
+
+import redis_client  # noqa: E402
+from config import settings  # noqa: E402
+from monitoring import registry  # noqa: E402
+
+
+class StubPipeline:
+    def __init__(self, owner: "StubRedis") -> None:
+        self._owner = owner
+        self._queued: List[Tuple[str, int, Any]] = []
+
+    async def __aenter__(self) -> "StubPipeline":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    def setex(self, key: str, ttl: int, value: Any) -> None:
+        self._queued.append((key, ttl, value))
+
+    async def execute(self) -> List[bool]:
+        for key, ttl, value in self._queued:
+            await self._owner.setex(key, ttl, value)
+        return [True] * len(self._queued)
+
+
+class StubRedis:
+    def __init__(self) -> None:
+        self.store: Dict[str, Any] = {}
+        self.mget_calls: List[List[str]] = []
+        self.setex_calls: List[str] = []
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.store.get(key)
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        self.mget_calls.append(list(keys))
+        return [self.store.get(key) for key in keys]
+
+    async def setex(self, key: str, ttl: int, value: Any) -> None:
+        self.setex_calls.append(key)
+        self.store[key] = value
+
+    def pipeline(self, transaction: bool = True) -> StubPipeline:
+        return StubPipeline(self)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def l1_settings(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeClock]:
+    clock = FakeClock()
+    monkeypatch.setattr(settings, "CACHE_L1_TTL_SEC", 5.0)
+    monkeypatch.setattr(settings, "CACHE_L1_MAXSIZE", 1024)
+    # Patch the module's view of ``time`` only, so the event loop clock is untouched.
+    monkeypatch.setattr(
+        redis_client, "time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    redis_client._L1.clear()
+    yield clock
+    redis_client._L1.clear()
+
+
+def _counter(name: str, bucket: str) -> float:
+    return registry.get_sample_value(name, {"bucket": bucket}) or 0.0
+
+
+def _loader(value: Any, calls: List[str], name: str) -> Callable[[], Awaitable[Any]]:
+    async def load() -> Any:
+        calls.append(name)
+        return value
+
+    return load
+
+
+def test_l1_entry_expires_after_ttl(l1_settings: FakeClock) -> None:
+    misses_before = _counter("cache_miss_total", "l1")
+    redis_client._l1_put("lumi:tenant:1:config", {"id": "1"})
+
+    l1_settings.now += 4.9
+    assert redis_client._l1_get("lumi:tenant:1:config") == (True, {"id": "1"})
+
+    l1_settings.now += 0.1
+    assert redis_client._l1_get("lumi:tenant:1:config") == (False, None)
+    assert "lumi:tenant:1:config" not in redis_client._L1
+    assert _counter("cache_miss_total", "l1") == misses_before + 1
+
+
+def test_disabled_l1_is_not_counted_as_a_miss(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    redis_client._l1_put("lumi:tenant:1:config", {"id": "1"})
+    monkeypatch.setattr(settings, "CACHE_L1_TTL_SEC", 0)
+    misses_before = _counter("cache_miss_total", "l1")
+
+    assert redis_client._l1_get("lumi:tenant:1:config") == (False, None)
+    assert redis_client._l1_get("lumi:tenant:2:config") == (False, None)
+    assert _counter("cache_miss_total", "l1") == misses_before
+
+
+def test_l1_evicts_least_recently_used_beyond_maxsize(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "CACHE_L1_MAXSIZE", 2)
+    redis_client._l1_put("a", 1)
+    redis_client._l1_put("b", 2)
+    # Reading ``a`` makes ``b`` the least recently used entry.
+    assert redis_client._l1_get("a") == (True, 1)
+
+    redis_client._l1_put("c", 3)
+
+    assert list(redis_client._L1) == ["a", "c"]
+    assert redis_client._l1_get("b") == (False, None)
+
+
+def test_l1_invalidate_prefix_only_drops_matching_keys() -> None:
+    redis_client._l1_put("lumi:tenant:1:config", {"id": "1"})
+    redis_client._l1_put("lumi:tenant:1:faqs", [])
+    redis_client._l1_put("lumi:tenant:10:config", {"id": "10"})
+
+    redis_client.l1_invalidate_prefix("lumi:tenant:1:")
+
+    assert list(redis_client._L1) == ["lumi:tenant:10:config"]
+
+
+def test_cached_json_many_keeps_entry_order_across_hits_and_misses(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    stub = StubRedis()
+    stub.store["k:redis"] = orjson.dumps({"from": "redis"}).decode()
+    monkeypatch.setattr(redis_client.redis_wrapper, "client", stub)
+    redis_client._l1_put("k:l1", {"from": "l1"})
+    calls: List[str] = []
+    l1_hits_before = _counter("cache_hit_total", "l1")
+    redis_hits_before = _counter("cache_hit_total", "redis")
+    redis_misses_before = _counter("cache_miss_total", "redis")
+
+    results = asyncio.run(
+        redis_client.cached_json_many(
+            [
+                ("k:miss", 60, _loader({"from": "loader"}, calls, "miss")),
+                ("k:l1", 60, _loader(None, calls, "l1")),
+                ("k:redis", 60, _loader(None, calls, "redis")),
+            ]
+        )
+    )
+
+    assert results == [{"from": "loader"}, {"from": "l1"}, {"from": "redis"}]
+    assert calls == ["miss"]
+    assert stub.mget_calls == [["k:miss", "k:redis"]]
+    assert stub.setex_calls == ["k:miss"]
+    assert orjson.loads(stub.store["k:miss"]) == {"from": "loader"}
+    assert redis_client._l1_get("k:redis") == (True, {"from": "redis"})
+    assert _counter("cache_hit_total", "l1") == l1_hits_before + 2
+    assert _counter("cache_hit_total", "redis") == redis_hits_before + 1
+    assert _counter("cache_miss_total", "redis") == redis_misses_before + 1
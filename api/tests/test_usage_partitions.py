@@ -0,0 +1,133 @@
+import asyncio
+import importlib.util
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from types import ModuleType, SimpleNamespace
+from typing import Any, Iterator, List, Optional
+
+sys.path.append("api")
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_usage_partitions.db")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("VERIFY_TOKEN", "verify")
+os.environ.setdefault("WH_TOKEN", "wh-token")
+os.environ.setdefault("WH_PHONE_ID", "phone-1")
+os.environ.setdefault("X_ADMIN_TOKEN", "admin")
+
+from constants import USAGE_PARTITION_MONTHS_AHEAD  # noqa: E402
+from jobs import usage_partitions  # noqa: E402
+
+MIGRATION_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "alembic",
+    "versions",
+    "010_partition_messages_usage.py",
+)
+
+
+def _load_migration() -> ModuleType:
+    spec = importlib.util.spec_from_file_location(
+        "partition_migration_010", MIGRATION_PATH
+    )
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubConnection:
+    def __init__(self, engine: "StubEngine") -> None:
+        self._engine = engine
+
+    def execute(self, statement: Any, params: Any = None) -> Any:
+        sql = " ".join(str(statement).split())
+        self._engine.statements.append(sql)
+        if "relkind" in sql:
+            return SimpleNamespace(scalar=lambda: True)
+        if "partdefid" in sql:
+            return SimpleNamespace(scalar=lambda: self._engine.default)
+        if "date_trunc" in sql:
+            return [(month,) for month in self._engine.stranded]
+        return SimpleNamespace(rowcount=7)
+
+
+class StubEngine:
+    dialect = SimpleNamespace(name="postgresql")
+
+    def __init__(
+        self, default: Optional[str] = "usage_default", stranded: Any = ()
+    ) -> None:
+        self.default = default
+        self.stranded: List[date] = list(stranded)
+        self.statements: List[str] = []
+
+    @contextmanager
+    def connect(self) -> Iterator[StubConnection]:
+        yield StubConnection(self)
+
+    @contextmanager
+    def begin(self) -> Iterator[StubConnection]:
+        yield StubConnection(self)
+
+
+def _create_sql(migration: ModuleType, month: date) -> str:
+    name, start, end = migration._usage_partition(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS public.{name} PARTITION OF public.usage "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+@pytest.mark.parametrize(
+    "month",
+    [date(2024, 1, 1), date(2024, 11, 1), date(2024, 12, 1), date(2025, 2, 1)],
+)
+def test_partition_names_and_bounds_match_migration(month: date) -> None:
+    migration = _load_migration()
+
+    assert usage_partitions._usage_partition(month) == migration._usage_partition(month)
+
+
+def test_job_creates_migration_named_partitions_ahead(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    migration = _load_migration()
+    stub = StubEngine()
+    monkeypatch.setattr(usage_partitions, "engine", stub)
+
+    asyncio.run(usage_partitions.ensure_usage_partitions())
+
+    assert USAGE_PARTITION_MONTHS_AHEAD == migration.USAGE_MONTHS_AHEAD
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    expected = [
+        _create_sql(migration, migration._add_months(current, offset))
+        for offset in range(USAGE_PARTITION_MONTHS_AHEAD + 1)
+    ]
+    assert stub.statements[3:] == expected
+
+
+def test_job_moves_stranded_default_rows_into_new_partition(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    migration = _load_migration()
+    stranded = date(2019, 2, 1)
+    stub = StubEngine(stranded=[stranded])
+    monkeypatch.setattr(usage_partitions, "engine", stub)
+
+    asyncio.run(usage_partitions.ensure_usage_partitions())
+
+    split = stub.statements[3:7]
+    assert split[0] == "ALTER TABLE public.usage DETACH PARTITION public.usage_default"
+    assert split[1] == _create_sql(migration, stranded)
+    assert split[2].startswith("WITH moved AS ( DELETE FROM public.usage_default")
+    assert split[2].endswith("INSERT INTO public.usage_2019_02 SELECT * FROM moved")
+    assert split[3] == (
+        "ALTER TABLE public.usage ATTACH PARTITION public.usage_default DEFAULT"
+    )
+    # Months still ahead of the data are created as usual.
+    assert not any("DETACH" in sql for sql in stub.statements[7:])